@@ -0,0 +1,75 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stub_chat_server import start_server
+from src.config import Config
+from src.content_generator import ContentGenerator
+from src.utils.content_cache import ContentCache
+from src.utils.db_handler import DatabaseHandler
+
+def measure(items: int, distinct: int, concurrency: int, server, cache=None) -> dict:
+    """generate content for synthetic items against the stub server"""
+    Config.CONTENT_CONCURRENCY = concurrency
+    generator = ContentGenerator(cache)
+    # every item is its own product unless distinct says how many products they repeat
+    listings = [
+        {'item_code': f"BM{idx:07d}", 'description': f"oak dining table model {idx % (distinct or items)}",
+         'quantity': 1, 'price': 100.0}
+        for idx in range(items)
+    ]
+    
+    start = time.perf_counter()
+    ok = failed = 0
+    for _, content, error in generator.generate_batch(listings):
+        if error is None:
+            ok += 1
+        else:
+            failed += 1
+    seconds = time.perf_counter() - start
+    return {'items': items, 'concurrency': concurrency, 'ok': ok, 'failed': failed,
+            'seconds': seconds, 'items_per_sec': items / seconds, 'server': dict(server.stats),
+            'cache': cache.get_stats() if cache else None}
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark batch content generation against a stub api")
+    parser.add_argument('--items', type=int, default=200)
+    parser.add_argument('--distinct', type=int, default=0, help="distinct products among the items, 0 for all")
+    parser.add_argument('--cache', action='store_true', help="use a content cache, kept across the concurrency runs")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 32])
+    parser.add_argument('--latency', type=float, default=0.2, help="stub seconds per completion")
+    parser.add_argument('--error-rate', type=float, default=0.02, help="stub fraction of 500s")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.02, help="stub fraction of 429s")
+    parser.add_argument('--rpm', type=int, default=0, help="stub requests per minute limit")
+    parser.add_argument('--client-rpm', type=int, default=100000, help="client side requests per minute")
+    parser.add_argument('--output', default='bench_content.json')
+    args = parser.parse_args()
+    
+    Config.OPENAI_API_KEY = Config.OPENAI_API_KEY or 'stub'
+    Config.OPENAI_REQUESTS_PER_MINUTE = args.client_rpm
+    Config.OPENAI_TOKENS_PER_MINUTE = args.client_rpm * 1000
+    Config.CONTENT_CACHE_ENABLED = False
+    cache = ContentCache(DatabaseHandler(os.path.join(tempfile.mkdtemp(), 'bench.db'))) if args.cache else None
+    
+    results = []
+    for concurrency in args.concurrency:
+        server = start_server(latency=args.latency, error_rate=args.error_rate,
+                              rate_limit_rate=args.rate_limit_rate, requests_per_minute=args.rpm)
+        Config.OPENAI_BASE_URL = server.base_url
+        result = measure(args.items, args.distinct, concurrency, server, cache)
+        server.shutdown()
+        results.append(result)
+        print(f"concurrency {concurrency:>3}: {result['seconds']:>7.2f}s  {result['items_per_sec']:>7.1f} items/s  "
+              f"ok {result['ok']}  failed {result['failed']}  server {result['server']}  cache {result['cache']}")
+    
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'settings': vars(args), 'results': results}, f, indent=2)
+    print(f"results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
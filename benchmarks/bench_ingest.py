@@ -0,0 +1,151 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from queue import Empty
+from zipfile import ZipFile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.workbook_generator import generate_workbook
+from src.utils.drawing_parser import DrawingParser
+from src.utils.excel_handler import ExcelHandler
+
+try:
+    import resource
+except ImportError:  # windows
+    resource = None
+
+def _peak_rss_mb() -> float:
+    """peak resident set size of this process in mb, None where unsupported"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux reports kilobytes, macos bytes
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+def _stage_anchors(file_path: str) -> int:
+    with ZipFile(file_path) as archive:
+        parser = DrawingParser(archive)
+        return len(parser.get_row_images(parser.get_sheet_path()))
+
+def _stage_extract_images(file_path: str) -> int:
+    handler = ExcelHandler(file_path)
+    with ZipFile(file_path) as archive:
+        parser = DrawingParser(archive)
+        rows = parser.get_row_images(parser.get_sheet_path())
+    # generated item codes follow their sheet row
+    return len(handler._extract_and_map_images({row: f"BM{row - 2:07d}" for row in rows}))
+
+def _stage_read_listings(file_path: str) -> int:
+    return sum(1 for listing in ExcelHandler(file_path).read_listings() if isinstance(listing['image'], str))
+
+def _stage_iter_listings(file_path: str) -> int:
+    return sum(1 for listing in ExcelHandler(file_path).iter_listings() if listing['image'])
+
+# stage name -> (function returning images handled, clear the image store first)
+STAGES = {
+    'drawing_anchors': (_stage_anchors, True),
+    'extract_images': (_stage_extract_images, True),
+    'read_listings': (_stage_read_listings, True),
+    'iter_listings': (_stage_iter_listings, True),
+    'iter_listings_warm': (_stage_iter_listings, False),
+}
+
+def _run_stage(stage: str, file_path: str, queue):
+    """run one stage in a fresh process so its peak rss is its own"""
+    func, _ = STAGES[stage]
+    devnull = open(os.devnull, 'w')
+    sys.stdout = devnull  # the handlers print debug output
+    result = {'error': "stage exited without a result"}
+    try:
+        start = time.perf_counter()
+        images = func(file_path)
+        seconds = time.perf_counter() - start
+        result = {'seconds': seconds, 'images': images, 'peak_rss_mb': _peak_rss_mb()}
+    except Exception as e:
+        result = {'error': f"{type(e).__name__}: {str(e)}", 'traceback': traceback.format_exc()}
+        raise
+    finally:
+        # the parent waits on the queue, it always gets an answer
+        queue.put(result)
+
+def measure(stage: str, file_path: str) -> dict:
+    """time a stage in a child process"""
+    _, cold = STAGES[stage]
+    if cold:
+        shutil.rmtree(os.path.join(os.path.dirname(file_path), 'images'), ignore_errors=True)
+    
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_run_stage, args=(stage, file_path, queue))
+    process.start()
+    while True:
+        try:
+            result = queue.get(timeout=1)
+            break
+        except Empty:
+            # killed outright (e.g. out of memory) without reaching its finally
+            if not process.is_alive():
+                raise Exception(f"error in stage {stage}: process died with exit code {process.exitcode}")
+    process.join()
+    if 'error' in result:
+        raise Exception(f"error in stage {stage}: {result['error']}\n{result.get('traceback', '')}")
+    result['images_per_sec'] = result['images'] / result['seconds'] if result['seconds'] else None
+    return result
+
+def _git_revision() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).strip()
+    except Exception:
+        return 'unknown'
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark excel ingest stages on synthetic workbooks")
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--image-size', type=int, default=200, help="image width/height in pixels")
+    parser.add_argument('--image-ratio', type=float, default=1.0, help="fraction of rows carrying a picture")
+    parser.add_argument('--image-variants', type=int, default=50, help="distinct image payloads in the workbook")
+    parser.add_argument('--stages', nargs='+', default=list(STAGES), choices=list(STAGES))
+    parser.add_argument('--output', default='bench_results.json')
+    args = parser.parse_args()
+    
+    results = []
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'data', 'bench.xlsx')
+            start = time.perf_counter()
+            image_rows = generate_workbook(file_path, rows, args.image_size, args.image_ratio, args.image_variants)
+            print(f"generated {rows} rows / {len(image_rows)} images in {time.perf_counter() - start:.1f}s "
+                  f"({os.path.getsize(file_path) / 1024 / 1024:.1f} MB)")
+            
+            for stage in args.stages:
+                result = measure(stage, file_path)
+                result.update({'stage': stage, 'rows': rows, 'image_size': args.image_size})
+                results.append(result)
+                rss = f"{result['peak_rss_mb']:.0f} MB" if result['peak_rss_mb'] is not None else "n/a"
+                print(f"  {stage:<20} {result['seconds']:>8.2f}s  peak rss {rss:>8}  "
+                      f"{result['images_per_sec'] or 0:>10.0f} images/s")
+    
+    report = {
+        'revision': _git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'settings': {'image_size': args.image_size, 'image_ratio': args.image_ratio, 'image_variants': args.image_variants},
+        'results': results
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,47 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.db_handler import DatabaseHandler
+
+# list membership is O(rows x listings), so it is timed on a sample and extrapolated
+LIST_SCAN_SAMPLE = 1000
+
+def setup_db(db_path: str, existing: int) -> DatabaseHandler:
+    """create a database holding `existing` listings"""
+    db = DatabaseHandler(db_path=db_path)
+    with db.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO listings (item_code, title, description, price, fingerprint) VALUES (?, ?, ?, ?, ?)",
+            ((f"IC{i:07d}", "title", "description", 10.0, f"fp{i}") for i in range(existing))
+        )
+        conn.commit()
+    return db
+
+def bench(rows: int):
+    """time new-item detection for `rows` incoming rows, half of them already imported"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = setup_db(os.path.join(tmp_dir, 'bench.db'), rows)
+        incoming = [(f"IC{i:07d}", f"fp{i}") for i in range(rows // 2, rows + rows // 2)]
+        
+        # old approach: python list from get_existing_listings + `in` per row
+        start = time.perf_counter()
+        current_listings = db.get_existing_listings()
+        sample = incoming[:LIST_SCAN_SAMPLE]
+        new_items = [code for code, _ in sample if code not in current_listings]
+        list_time = (time.perf_counter() - start) * len(incoming) / len(sample)
+        
+        # set-based detection inside sqlite
+        start = time.perf_counter()
+        changed = db.find_changed_listings(incoming)
+        sql_time = time.perf_counter() - start
+        
+        assert len(changed) == rows - rows // 2
+        print(f"{rows:>8} rows | list scan (est.) {list_time:>9.3f}s | sqlite anti-join {sql_time:>7.3f}s")
+
+if __name__ == "__main__":
+    for rows in (1_000, 10_000, 100_000):
+        bench(rows)
\ No newline at end of file
@@ -0,0 +1,134 @@
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class StubChatServer(ThreadingHTTPServer):
+    """imitates the chat completions endpoint: fixed latency, injected 429/5xx, an rpm limit
+    
+    point Config.OPENAI_BASE_URL at http://host:port/v1 to generate content against it
+    """
+    
+    daemon_threads = True
+    
+    def __init__(self, address, latency: float = 0.5, error_rate: float = 0.0, rate_limit_rate: float = 0.0,
+                 requests_per_minute: int = 0, seed: int = 0):
+        super().__init__(address, StubChatHandler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.requests_per_minute = requests_per_minute
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.request_times = []
+        self.stats = {'requests': 0, 'ok': 0, 'rate_limited': 0, 'errors': 0, 'max_in_flight': 0}
+        self._in_flight = 0
+    
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.server_address[0]}:{self.server_address[1]}/v1"
+    
+    def admit(self) -> int:
+        """decide the status code for a request, enforcing the rpm limit over a sliding minute"""
+        with self.lock:
+            now = time.monotonic()
+            self.stats['requests'] += 1
+            self.request_times = [t for t in self.request_times if now - t < 60]
+            if self.requests_per_minute and len(self.request_times) >= self.requests_per_minute:
+                self.stats['rate_limited'] += 1
+                return 429
+            self.request_times.append(now)
+            roll = self.rng.random()
+            if roll < self.rate_limit_rate:
+                self.stats['rate_limited'] += 1
+                return 429
+            if roll < self.rate_limit_rate + self.error_rate:
+                self.stats['errors'] += 1
+                return 500
+            self._in_flight += 1
+            self.stats['max_in_flight'] = max(self.stats['max_in_flight'], self._in_flight)
+            return 200
+    
+    def release(self):
+        with self.lock:
+            self._in_flight -= 1
+            self.stats['ok'] += 1
+
+class StubChatHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+    
+    def _send(self, status: int, body: dict, headers: dict = None):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        if not self.path.endswith('/chat/completions'):
+            self._send(404, {'error': {'message': 'not found'}})
+            return
+        
+        status = self.server.admit()
+        if status == 429:
+            self._send(429, {'error': {'message': 'rate limit reached', 'type': 'requests'}}, {'retry-after-ms': '200'})
+            return
+        if status != 200:
+            self._send(status, {'error': {'message': 'server error', 'type': 'server_error'}})
+            return
+        
+        try:
+            time.sleep(self.server.latency)
+            item = json.loads(request['messages'][-1]['content'])
+            content = {
+                'title': str(item.get('description') or 'Item').strip().title()[:60],
+                'description': f"Quality piece in good condition, asking ${float(item.get('price') or 0):.2f}."
+            }
+            prompt_tokens = sum(len(message['content']) for message in request['messages']) // 4
+            self._send(200, {
+                'id': f"chatcmpl-stub-{time.monotonic_ns()}",
+                'object': 'chat.completion',
+                'created': int(time.time()),
+                'model': request.get('model', 'stub'),
+                'choices': [{
+                    'index': 0,
+                    'message': {'role': 'assistant', 'content': json.dumps(content)},
+                    'finish_reason': 'stop'
+                }],
+                'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': 40, 'total_tokens': prompt_tokens + 40}
+            })
+        finally:
+            self.server.release()
+
+def start_server(port: int = 0, **options) -> StubChatServer:
+    """start a stub server on a background thread, port 0 picks a free one"""
+    server = StubChatServer(('127.0.0.1', port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="stub chat completions server for content generation testing")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.5, help="seconds per completion")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of requests answered 500")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help="fraction of requests answered 429")
+    parser.add_argument('--rpm', type=int, default=0, help="requests per minute before answering 429, 0 for none")
+    args = parser.parse_args()
+    
+    server = StubChatServer(('127.0.0.1', args.port), latency=args.latency, error_rate=args.error_rate,
+                            rate_limit_rate=args.rate_limit_rate, requests_per_minute=args.rpm)
+    print(f"stub chat completions at {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
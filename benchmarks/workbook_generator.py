@@ -0,0 +1,135 @@
+import os
+import random
+import struct
+import zlib
+from typing import List
+from zipfile import ZipFile, ZIP_DEFLATED
+
+# package parts that never change between generated workbooks
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Default Extension="png" ContentType="image/png"/>
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>
+<Override PartName="/xl/drawings/drawing1.xml" ContentType="application/vnd.openxmlformats-officedocument.drawing+xml"/>
+</Types>"""
+
+ROOT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>"""
+
+WORKBOOK = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<bookViews><workbookView activeTab="0"/></bookViews>
+<sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets>
+</workbook>"""
+
+WORKBOOK_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
+</Relationships>"""
+
+STYLES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>
+<fills count="1"><fill><patternFill patternType="none"/></fill></fills>
+<borders count="1"><border/></borders>
+<cellStyleXfs count="1"><xf/></cellStyleXfs>
+<cellXfs count="1"><xf xfId="0"/></cellXfs>
+<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>
+</styleSheet>"""
+
+SHEET_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/drawing" Target="../drawings/drawing1.xml"/>
+</Relationships>"""
+
+ANCHOR = """<xdr:twoCellAnchor editAs="oneCell"><xdr:from><xdr:col>1</xdr:col><xdr:colOff>0</xdr:colOff><xdr:row>{row}</xdr:row><xdr:rowOff>0</xdr:rowOff></xdr:from><xdr:to><xdr:col>2</xdr:col><xdr:colOff>0</xdr:colOff><xdr:row>{next_row}</xdr:row><xdr:rowOff>0</xdr:rowOff></xdr:to><xdr:pic><xdr:nvPicPr><xdr:cNvPr id="{pic_id}" name="Picture {pic_id}"/><xdr:cNvPicPr/></xdr:nvPicPr><xdr:blipFill><a:blip r:embed="rId{media_id}"/><a:stretch><a:fillRect/></a:stretch></xdr:blipFill><xdr:spPr><a:prstGeom prst="rect"><a:avLst/></a:prstGeom></xdr:spPr></xdr:pic><xdr:clientData/></xdr:twoCellAnchor>"""
+
+DESCRIPTIONS = ['oak dining table', 'walnut side chair', 'linen sofa', 'steel bar stool', 'pine bookshelf', 'glass coffee table']
+
+def make_png(size: int, seed: int) -> bytes:
+    """encode a size x size rgb png of random noise, which compresses like a photo"""
+    rng = random.Random(seed)
+    raw = b''.join(b'\x00' + rng.randbytes(size * 3) for _ in range(size))
+    
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data))
+    
+    header = struct.pack('>IIBBBBB', size, size, 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', zlib.compress(raw, 6)) + chunk(b'IEND', b'')
+
+def _inline(ref: str, text: str) -> str:
+    """inline string cell"""
+    text = text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    return f'<c r="{ref}" t="inlineStr"><is><t>{text}</t></is></c>'
+
+def generate_workbook(path: str, rows: int, image_size: int = 200, image_ratio: float = 1.0,
+                      image_variants: int = 50, seed: int = 0) -> List[int]:
+    """write a supplier-layout workbook and return the 0-based sheet rows that carry an image
+    
+    layout matches what ExcelHandler expects: an empty first row, a header row with
+    'ITEM CODE' in column C, then description / image / item code / quantity / price /
+    total in columns A..F, with pictures anchored on column B of their row.
+    """
+    rng = random.Random(seed)
+    image_rows = []
+    
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with ZipFile(path, 'w', ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', CONTENT_TYPES)
+        archive.writestr('_rels/.rels', ROOT_RELS)
+        archive.writestr('xl/workbook.xml', WORKBOOK)
+        archive.writestr('xl/_rels/workbook.xml.rels', WORKBOOK_RELS)
+        archive.writestr('xl/styles.xml', STYLES)
+        archive.writestr('xl/worksheets/_rels/sheet1.xml.rels', SHEET_RELS)
+        
+        # sheet data, streamed so 100k rows never sit in memory as one string
+        with archive.open('xl/worksheets/sheet1.xml', 'w') as sheet:
+            sheet.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                        b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>')
+            header = ''.join(_inline(f'{col}2', name) for col, name in zip('ACDEF', ['DESCRIPTION', 'ITEM CODE', 'QTY', 'PRICE', 'TOTAL']))
+            sheet.write(f'<row r="1"/><row r="2">{header}</row>'.encode('utf-8'))
+            
+            for idx in range(rows):
+                r = idx + 3
+                quantity = rng.randint(1, 20)
+                price = round(rng.uniform(5, 900), 2)
+                description = f"{rng.choice(DESCRIPTIONS)} {idx}\n"
+                sheet.write((
+                    f'<row r="{r}">{_inline(f"A{r}", description)}{_inline(f"C{r}", f"BM{idx:07d}")}'
+                    f'<c r="D{r}"><v>{quantity}</v></c><c r="E{r}"><v>{price}</v></c>'
+                    f'<c r="F{r}"><f>D{r}*E{r}</f><v>{round(quantity * price, 2)}</v></c></row>'
+                ).encode('utf-8'))
+                if rng.random() < image_ratio:
+                    image_rows.append(r - 1)
+            sheet.write(b'</sheetData><drawing r:id="rId1" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"/></worksheet>')
+        
+        # a fixed pool of image payloads, referenced round-robin by the anchors
+        variants = min(image_variants, len(image_rows)) or 1
+        for media_id in range(1, variants + 1):
+            archive.writestr(f'xl/media/image{media_id}.png', make_png(image_size, seed + media_id))
+        
+        rels = ''.join(
+            f'<Relationship Id="rId{media_id}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/image" Target="../media/image{media_id}.png"/>'
+            for media_id in range(1, variants + 1)
+        )
+        archive.writestr('xl/drawings/_rels/drawing1.xml.rels',
+                         f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">{rels}</Relationships>')
+        
+        with archive.open('xl/drawings/drawing1.xml', 'w') as drawing:
+            drawing.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                          b'<xdr:wsDr xmlns:xdr="http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing" '
+                          b'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+                          b'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">')
+            for pic_id, row in enumerate(image_rows, 1):
+                media_id = (pic_id - 1) % variants + 1
+                drawing.write(ANCHOR.format(row=row, next_row=row + 1, pic_id=pic_id, media_id=media_id).encode('utf-8'))
+            drawing.write(b'</xdr:wsDr>')
+    
+    return image_rows
\ No newline at end of file
@@ -0,0 +1,36 @@
+import argparse
+from src.utils.posting_metrics import PostingMetrics
+
+def _fmt(seconds) -> str:
+    return f"{seconds:8.2f}s" if seconds is not None else f"{'-':>9}"
+
+def posting_report(run_id: str = None, runs: int = 10):
+    metrics = PostingMetrics()
+    
+    # where the time goes, phase by phase
+    print(f"Phase timings ({run_id or 'all runs'})")
+    print(f"{'phase':<12} {'count':>7} {'failed':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'share':>7}")
+    stats = metrics.get_phase_stats(run_id)
+    grand_total = sum(phase['total'] for phase in stats.values()) or 1
+    for name, phase in stats.items():
+        print(f"{name:<12} {phase['count']:>7} {phase['failed']:>7} {_fmt(phase['p50'])} {_fmt(phase['p95'])} "
+              f"{_fmt(phase['p99'])} {phase['total'] / grand_total:>6.1%}")
+    
+    # throughput per run
+    print()
+    print("Runs")
+    print(f"{'run':<32} {'posted':>7} {'attempts':>9} {'hours':>7} {'listings/h':>11}")
+    selected = [run for run in metrics.get_run_stats() if not run_id or run['run_id'] == run_id]
+    for run in selected[:runs]:
+        per_hour = f"{run['listings_per_hour']:.1f}" if run['listings_per_hour'] is not None else "-"
+        print(f"{run['run_id']:<32} {run['posted']:>7} {run['attempts']:>9} {run['seconds'] / 3600:>7.2f} {per_hour:>11}")
+
+def main():
+    parser = argparse.ArgumentParser(description="report posting phase timings and throughput")
+    parser.add_argument('--run', help="only report this run id")
+    parser.add_argument('--runs', type=int, default=10, help="number of recent runs to list")
+    args = parser.parse_args()
+    posting_report(args.run, args.runs)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,121 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Dict
+from .utils.feed_readers import get_reader
+from .utils.listing_reader import fingerprint_listing
+from .utils.image_cache import ImageCache
+from .utils.image_processor import ImageProcessor
+import os
+import time
+
+def parse_sheet(file_path: str, sheet_name: str) -> Dict:
+    """parse one sheet into fingerprinted listings (runs in a worker process)"""
+    start_time = time.time()
+    
+    # images are stored here, the parent links the items it keeps and saves the manifest
+    image_cache = ImageCache(Path(file_path).parent / 'images', defer_links=True)
+    listings = []
+    for item in get_reader(file_path).iter_listings(sheet_name, image_cache=image_cache):
+        item['fingerprint'] = fingerprint_listing(item)
+        listings.append(item)
+    
+    return {
+        'file': file_path,
+        'sheet': sheet_name,
+        'listings': listings,
+        'image_changes': image_cache.changes,
+        'seconds': time.time() - start_time
+    }
+
+class BatchImporter:
+    """imports every sheet of several workbooks concurrently"""
+    
+    def __init__(self, listing_manager, max_workers: int = None):
+        self.listing_manager = listing_manager
+        self.max_workers = max_workers or os.cpu_count()
+    
+    def import_files(self, file_paths: List[str]) -> Dict:
+        """parse all sheets in a process pool, merge them and write the result in one transaction"""
+        start_time = time.time()
+        summary = {'files': [], 'conflicts': {}, 'inserted': 0, 'updated': 0, 'unchanged': 0, 'errors': []}
+        
+        # discover every sheet of every workbook
+        jobs = []
+        for file_path in sorted(file_paths):
+            try:
+                for sheet_name in get_reader(file_path).get_sheet_names():
+                    jobs.append((file_path, sheet_name))
+            except Exception as e:
+                summary['errors'].append(f"{os.path.basename(file_path)}: {str(e)}")
+        
+        # parse sheets concurrently
+        results = {}
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(parse_sheet, *job): job for job in jobs}
+            for future in as_completed(futures):
+                file_path, sheet_name = futures[future]
+                try:
+                    results[(file_path, sheet_name)] = future.result()
+                except Exception as e:
+                    summary['errors'].append(f"{os.path.basename(file_path)} [{sheet_name}]: {str(e)}")
+        
+        # merge listings in file/sheet order, flagging item codes whose rows disagree
+        merged = {}
+        sources = {}
+        sources_jobs = {}
+        for job in jobs:
+            result = results.get(job)
+            if not result:
+                continue
+            source = f"{os.path.basename(result['file'])} [{result['sheet']}]"
+            summary['files'].append({'source': source, 'rows': len(result['listings']), 'seconds': result['seconds']})
+            
+            for item in result['listings']:
+                item_code = str(item['item_code'])
+                if item_code not in merged:
+                    merged[item_code] = item
+                    sources[item_code] = source
+                    sources_jobs[item_code] = job
+                elif merged[item_code]['fingerprint'] != item['fingerprint']:
+                    summary['conflicts'].setdefault(item_code, [sources[item_code]]).append(source)
+        
+        # conflicting rows are left out until the workbooks agree
+        for item_code in summary['conflicts']:
+            del merged[item_code]
+        
+        # fold in what the workers added to each image store in job order, so later sheets win
+        # like they would importing one by one, then link only the items that are kept
+        image_caches = {}
+        for job in jobs:
+            if job in results:
+                images_dir = Path(job[0]).parent / 'images'
+                if images_dir not in image_caches:
+                    image_caches[images_dir] = ImageCache(images_dir)
+                image_caches[images_dir].merge(results[job]['image_changes'])
+        for item_code, item in merged.items():
+            result = results[sources_jobs[item_code]]
+            object_name = result['image_changes']['items'].get(item_code)
+            if object_name and isinstance(item.get('image'), str):
+                item['image'] = image_caches[Path(result['file']).parent / 'images'].link_item(item_code, object_name)
+        for image_cache in image_caches.values():
+            image_cache.save()
+        
+        # normalize images on all cores
+        image_processor = ImageProcessor()
+        for item in merged.values():
+            if isinstance(item.get('image'), str):
+                image_processor.submit(item['image'], item['item_code'], item.get('image_hash'))
+        
+        try:
+            # only new or changed rows get content, written in one transaction
+            changed = self.listing_manager.find_changed_listings(list(merged.values()))
+            to_save = [item for item_code, item in merged.items() if item_code in changed]
+            counts = self.listing_manager.save_listings(to_save, chunk_size=None)
+            summary['inserted'] = counts['inserted']
+            summary['updated'] = counts['updated']
+            summary['unchanged'] = len(merged) - len(to_save)
+        finally:
+            summary['images'] = image_processor.close()
+        
+        summary['seconds'] = time.time() - start_time
+        return summary
\ No newline at end of file
@@ -1,18 +1,79 @@
 from selenium.webdriver import Chrome
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
-from typing import Optional
+from typing import Callable, Dict, Optional, Set, Tuple
 import undetected_chromedriver as uc
 from .config import Config
-import time
+from .utils.image_processor import ImageProcessor
+from .utils.page_waits import PageWaits
+import threading
 import os
+import re
+
+# elements several steps wait on
+TITLE_INPUT = (By.CSS_SELECTOR, '[aria-label="Title"]')
+PRICE_INPUT = (By.CSS_SELECTOR, '[aria-label="Price"]')
+DESCRIPTION_INPUT = (By.CSS_SELECTOR, '[aria-label="Description"]')
+LOGIN_FORM = (By.ID, 'login_popup_cta_form')
+PUBLISH_BUTTON = (By.XPATH, "//span[contains(text(), 'Publish')]")
+LEAVE_BUTTON = (By.XPATH, '/html/body/div[6]/div[1]/div/div[2]/div/div/div/div[4]/div/div[2]/div[1]')
+
+# the editable element for a selector, which may point at a wrapper around it
+FIND_FIELD_SCRIPT = """
+const findField = (selector) => {
+    const field = document.querySelector(selector);
+    if (!field || field instanceof HTMLInputElement || field instanceof HTMLTextAreaElement || field.isContentEditable) {
+        return field;
+    }
+    return field.querySelector('input, textarea, [contenteditable="true"]');
+};
+"""
+
+# sets [selector, value] pairs the way react sees typing: through the native value setter
+# (react's own setter would swallow the change) followed by input and change events
+FAST_FILL_SCRIPT = FIND_FIELD_SCRIPT + """
+for (const [selector, value] of arguments[0]) {
+    const field = findField(selector);
+    if (!field) {
+        continue;
+    }
+    field.focus();
+    if (field.isContentEditable) {
+        document.execCommand('selectAll', false, null);
+        document.execCommand('insertText', false, value);
+    } else {
+        const prototype = field instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+        Object.getOwnPropertyDescriptor(prototype, 'value').set.call(field, value);
+        field.dispatchEvent(new Event('input', {bubbles: true}));
+        field.dispatchEvent(new Event('change', {bubbles: true}));
+    }
+    field.blur();
+}
+"""
+
+# current value of each selector's field, null when it isn't on the page
+READ_FIELDS_SCRIPT = FIND_FIELD_SCRIPT + """
+const values = {};
+for (const selector of arguments[0]) {
+    const field = findField(selector);
+    values[selector] = field ? (field.isContentEditable ? field.innerText : field.value) : null;
+}
+return values;
+"""
 
 class BrowserController:
-    def __init__(self):
+    # undetected_chromedriver patches its driver binary on startup, so browsers start one at a time
+    _init_lock = threading.Lock()
+
+    def __init__(self, user_data_dir: Optional[str] = None):
         self.driver: Optional[Chrome] = None
+        self.waits: Optional[PageWaits] = None
         self.progress = None
+        self.user_data_dir = user_data_dir or Config.USER_DATA_DIR
+        # window handle of a create page loading in the background for the next listing
+        self.warm_tab: Optional[str] = None
 
     def set_progress(self, progress):
         """set progress bar instance"""
@@ -32,14 +93,18 @@ class BrowserController:
             options.add_argument('--disable-dev-shm-usage')
             
             # add user data directory to persist login
-            os.makedirs(Config.USER_DATA_DIR, exist_ok=True)
-            options.add_argument(f'--user-data-dir={Config.USER_DATA_DIR}')
+            os.makedirs(self.user_data_dir, exist_ok=True)
+            options.add_argument(f'--user-data-dir={self.user_data_dir}')
             options.add_argument('--profile-directory=Default')
             
             # initialize driver
             print("initializing browser...")
-            self.driver = uc.Chrome(options=options)
-            self.driver.implicitly_wait(Config.BROWSER_TIMEOUT)
+            with self._init_lock:
+                self.driver = uc.Chrome(options=options)
+            # explicit waits only, an implicit wait stretches every lookup that is expected to miss
+            self.driver.implicitly_wait(0)
+            self.driver.set_page_load_timeout(Config.PAGE_LOAD_TIMEOUT)
+            self.waits = PageWaits(self.driver)
             
             return True
             
@@ -54,13 +119,61 @@ class BrowserController:
                 return False
         
         try:
+            # a create page warmed during the last listing only has to finish loading
+            if self.warm_tab is not None and self._switch_to_warm_tab() and self._wait_for_create_page():
+                return True
             self.driver.get(Config.MARKETPLACE_URL)
-            time.sleep(Config.BROWSER_WAIT_TIME)  # wait for potential redirects
+            self._wait_for_create_page()
             return True
         except Exception as e:
             print(f"error navigating to marketplace: {str(e)}")
             return False
     
+    def _wait_for_create_page(self) -> bool:
+        """wait for redirects to end in the create form or the login popup"""
+        return self.waits.any_of([
+            EC.presence_of_element_located(TITLE_INPUT),
+            EC.presence_of_element_located(LOGIN_FORM)
+        ], timeout=Config.PAGE_LOAD_TIMEOUT) is not None
+    
+    def prewarm_create_page(self):
+        """start loading the create page in a background tab while the current form is filled
+        
+        the next navigate_to_marketplace switches to it instead of reloading, so the page
+        load overlaps with typing and uploading instead of following the publish
+        """
+        if self.warm_tab is not None:
+            return
+        form_tab = self.driver.current_window_handle
+        try:
+            self.driver.switch_to.new_window('tab')
+            self.warm_tab = self.driver.current_window_handle
+            # assigning the location returns at once, driver.get would block until the load is done
+            self.driver.execute_script("window.location.href = arguments[0];", Config.MARKETPLACE_URL)
+        except Exception as e:
+            if self.progress:
+                self.progress.add_debug(f"could not prewarm create page: {str(e)}")
+        finally:
+            self.driver.switch_to.window(form_tab)
+    
+    def _switch_to_warm_tab(self) -> bool:
+        """close the finished listing's tab and carry on in the warm one, False if it is gone"""
+        warm_tab, self.warm_tab = self.warm_tab, None
+        try:
+            if warm_tab not in self.driver.window_handles:
+                return False
+            for handle in self.driver.window_handles:
+                if handle != warm_tab:
+                    self.driver.switch_to.window(handle)
+                    self.driver.close()
+            self.driver.switch_to.window(warm_tab)
+            return True
+        except Exception as e:
+            print(f"error switching to prewarmed create page: {str(e)}")
+            # fall back to reloading in whichever tab is left
+            self.driver.switch_to.window(self.driver.window_handles[-1])
+            return False
+    
     def close(self):
         """close browser"""
         if self.driver:
@@ -70,84 +183,131 @@ class BrowserController:
                 print(f"error closing browser: {str(e)}")
             finally:
                 self.driver = None
+                self.waits = None
+                self.warm_tab = None
     
     def check_login_status(self) -> bool:
         """check if user is logged into facebook"""
         try:
-            # set a short implicit wait for this check
-            self.driver.implicitly_wait(1)
-            login_form = self.driver.find_elements("id", "login_popup_cta_form")
-            self.driver.implicitly_wait(5)  # restore to default wait time
+            # navigation already waited for the form or the popup, so a lookup is enough
+            login_form = self.driver.find_elements(*LOGIN_FORM)
             return len(login_form) == 0  # if form exists, user is not logged in
         except Exception as e:
             print(f"error checking login status: {str(e)}")
             return False
     
-    def post_listing(self, title: str, description: str, price: float, item_code: str, progress=None) -> bool:
-        """post a listing to marketplace"""
+    def fast_fill(self, fields: Dict[Tuple[str, str], str]) -> Set[Tuple[str, str]]:
+        """set css-located text fields in one script call, return the locators whose value stuck
+        
+        fields that are missing, rejected or reset by the page are left to keystrokes
+        """
+        try:
+            self.driver.execute_script(FAST_FILL_SCRIPT, [[locator[1], value] for locator, value in fields.items()])
+            # let the form re-render, then check what it really holds
+            self.waits.dom_quiet()
+            values = self.driver.execute_script(READ_FIELDS_SCRIPT, [locator[1] for locator in fields])
+        except Exception as e:
+            if self.progress:
+                self.progress.add_debug(f"fast fill rejected, typing instead: {str(e)}", error=True)
+            return set()
+        return {locator for locator, value in fields.items() if self._field_matches(values.get(locator[1]), value)}
+    
+    def _field_matches(self, actual: Optional[str], expected: str) -> bool:
+        """compare a read-back field value with what was filled in"""
+        if actual is None:
+            return False
+        actual = actual.replace('\r\n', '\n').strip()
+        expected = expected.replace('\r\n', '\n').strip()
+        if actual == expected:
+            return True
+        # a price field may reformat the number, e.g. 450.0 as 450 or 1,200
+        try:
+            return float(re.sub(r'[^\d.]', '', actual)) == float(expected)
+        except ValueError:
+            return False
+    
+    def _type_text(self, element, text: str):
+        """type text keystroke by keystroke, replacing anything a fast fill left behind"""
+        element.send_keys(Keys.CONTROL, 'a')
+        element.send_keys(text)
+    
+    def post_listing(self, title: str, description: str, price: float, item_code: str, progress=None,
+                     checkpoint: Optional[Callable[[str], None]] = None) -> bool:
+        """post a listing to marketplace
+        
+        checkpoint is called with each form phase as it is reached, 'publishing' right
+        before the publish click and 'published' once it went through
+        """
+        checkpoint = checkpoint or (lambda phase: None)
         try:
             if progress:
                 self.progress = progress
             
+            checkpoint('title')
+            
+            # fill every text field already on the form in one go, the phases below only type what didn't stick
+            filled = set()
+            if Config.FAST_FILL:
+                self.waits.present(TITLE_INPUT)
+                filled = self.fast_fill({TITLE_INPUT: title, PRICE_INPUT: str(price), DESCRIPTION_INPUT: description})
+                self.progress.add_debug(f"fast filled {len(filled)} of 3 text fields")
+            
+            # the form is up, start loading the next listing's page alongside it
+            if Config.PREWARM_CREATE_PAGE:
+                self.prewarm_create_page()
+            
             # find and enter title
-            self.progress.add_debug("looking for title input...")
-            title_input = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, '[aria-label="Title"]'))
-            )
-            self.progress.add_debug(f"entering title: {title[:90]}...")
-            title_input.send_keys(title)
-            self.progress.add_debug("title entered successfully")
+            if TITLE_INPUT not in filled:
+                self.progress.add_debug("looking for title input...")
+                title_input = self.waits.present(TITLE_INPUT)
+                self.progress.add_debug(f"entering title: {title[:90]}...")
+                self._type_text(title_input, title)
+                self.progress.add_debug("title entered successfully")
 
             # find and enter price
-            self.progress.add_debug("entering price...")
-            price_input = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, '[aria-label="Price"]'))
-            )
-            price_input.send_keys(str(price))
-            self.progress.add_debug("price entered successfully")
+            checkpoint('price')
+            if PRICE_INPUT not in filled:
+                self.progress.add_debug("entering price...")
+                price_input = self.waits.present(PRICE_INPUT)
+                self._type_text(price_input, str(price))
+                self.progress.add_debug("price entered successfully")
 
             # find and select category
+            checkpoint('category')
             self.progress.add_debug("selecting category...")
-            category_button = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, '[aria-label="Category"]'))
-            )
+            category_button = self.waits.clickable((By.CSS_SELECTOR, '[aria-label="Category"]'))
             category_button.click()
-            time.sleep(2)
-            # wait for dropdown and select furniture
-            furniture_option = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "/html/body/div[1]/div/div/div[1]/div/div[3]/div/div/div[2]/div/div/div[1]/div[1]/div/div/div/div/div/span/div/div[3]/div/div[1]/div/div/div/div/div/span/div/span"))
-            )
+            # wait for dropdown and select furniture once it stopped animating in
+            furniture_option = self.waits.clickable((By.XPATH, "/html/body/div[1]/div/div/div[1]/div/div[3]/div/div/div[2]/div/div/div[1]/div[1]/div/div/div/div/div/span/div/div[3]/div/div[1]/div/div/div/div/div/span/div/span"))
+            self.waits.dom_quiet()
             furniture_option.click()
             self.progress.add_debug("category selected successfully")
 
             # find and select condition
+            checkpoint('condition')
             self.progress.add_debug("selecting condition...")
-            condition_button = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, '[aria-label="Condition"]'))
-            )
+            condition_button = self.waits.clickable((By.CSS_SELECTOR, '[aria-label="Condition"]'))
             condition_button.click()
 
             # wait for dropdown menu to be visible
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, '[aria-label="Select an option"]'))
-            )
+            self.waits.present((By.CSS_SELECTOR, '[aria-label="Select an option"]'))
 
             # wait for dropdown and select new
-            new_option = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, '[role="option"] span:first-of-type'))
-            )
+            new_option = self.waits.clickable((By.CSS_SELECTOR, '[role="option"] span:first-of-type'))
             new_option.click()
             self.progress.add_debug("condition selected successfully")
 
             # find and click photo upload button
+            checkpoint('photo')
             self.progress.add_debug("looking for photo upload button...")
-            photo_input = self.driver.find_element(By.CSS_SELECTOR, 'input[type="file"]')
+            photo_input = self.waits.present((By.CSS_SELECTOR, 'input[type="file"]'))
             
-            # prepare image path - try different extensions
-            extensions = ['.jpg', '.jpeg', '.png']
+            # prepare image path - prefer the normalized copy, then try different extensions
+            image_paths = [ImageProcessor.get_normalized_path(item_code)]
+            for ext in ['.jpg', '.jpeg', '.png']:
+                image_paths.append(os.path.join(Config.DATA_DIR, 'images', f'image_{item_code}{ext}'))
             image_found = False
-            for ext in extensions:
-                image_path = os.path.join(Config.DATA_DIR, 'images', f'image_{item_code}{ext}')
+            for image_path in image_paths:
                 if os.path.exists(image_path):
                     photo_input.send_keys(image_path)
                     self.progress.add_debug("photo uploaded successfully")
@@ -155,63 +315,65 @@ class BrowserController:
                     break
 
             if not image_found:
-                self.progress.add_debug(f"warning: image not found for {item_code}", error=True)
-                time.sleep(1000)
+                # marketplace won't publish without a photo, fail now instead of stalling the run
+                raise Exception(f"image not found for {item_code}")
 
             # find and enter description
-            self.progress.add_debug("entering description...")
-            description_input = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, '[aria-label="Description"]'))
-            )
-            description_input.send_keys(description)
-            self.progress.add_debug("description entered successfully")
+            checkpoint('description')
+            if DESCRIPTION_INPUT not in filled and Config.FAST_FILL:
+                # the field may only have shown up once the category was picked
+                self.waits.present(DESCRIPTION_INPUT)
+                filled |= self.fast_fill({DESCRIPTION_INPUT: description})
+            if DESCRIPTION_INPUT not in filled:
+                self.progress.add_debug("entering description...")
+                description_input = self.waits.present(DESCRIPTION_INPUT)
+                self._type_text(description_input, description)
+                self.progress.add_debug("description entered successfully")
 
             # find and click publish button with retry logic
+            checkpoint('publishing')
             self.progress.add_debug("clicking publish...")
-            time.sleep(3)
+            # the photo upload has to finish before publish takes
+            if not self.waits.network_idle():
+                self.progress.add_debug("page still busy, publishing anyway...")
             max_retries = 3
             for attempt in range(max_retries):
                 try:
-                    publish_button = WebDriverWait(self.driver, 10).until(
-                        EC.element_to_be_clickable((By.XPATH, "//span[contains(text(), 'Publish')]"))
-                    )
-                    time.sleep(2)  # increased wait time to ensure page is stable
+                    publish_button = self.waits.clickable(PUBLISH_BUTTON)
+                    self.waits.dom_quiet()  # ensure page is stable
+                    form_url = self.driver.current_url
                     publish_button.click()
-                    self.progress.add_debug("listing published successfully")
-                    
-                    # handle potential "Leave Page" dialog
-                    try:
-                        leave_button = WebDriverWait(self.driver, 10).until(
-                            EC.element_to_be_clickable((By.XPATH, '/html/body/div[6]/div[1]/div/div[2]/div/div/div/div[4]/div/div[2]/div[1]'))
-                        )
-                        time.sleep(0.5)
-                        leave_button.click()
-                        self.progress.add_debug("handled leave page dialog")
-                    except:
-                        # no leave page dialog appeared, continue normally
-                        pass
-                    
-                    return True
+                    break
                     
                 except Exception as e:
                     if attempt < max_retries - 1:
                         self.progress.add_debug(f"retry attempt {attempt + 1} for publish button...")
-                        time.sleep(1)
+                        self.waits.dom_quiet()
                         continue
                     else:
                         if self.progress:
                             self.progress.add_debug(f"ERROR: {str(e)}", error=True)
-                            self.progress.add_debug("Press Enter to continue...", error=True)
-                            time.sleep(0.1)
-                            input()
                         return False
-
-            return False
+            
+            # only getting to the click is retried, once it happened a second click could post twice
+            # and any failure below fails the listing. the form goes away, or a "Leave Page" dialog asks first
+            outcome = self.waits.any_of([
+                EC.element_to_be_clickable(LEAVE_BUTTON),
+                EC.url_changes(form_url),
+                EC.invisibility_of_element_located(PUBLISH_BUTTON)
+            ])
+            if outcome is None:
+                raise Exception("publish was clicked but the form did not go away")
+            if outcome[0] == 0:
+                outcome[1].click()
+                self.progress.add_debug("handled leave page dialog")
+            self.progress.add_debug("listing published successfully")
+            
+            checkpoint('published')
+            return True
             
         except Exception as e:
+            # runs on a posting worker thread, the pool records the failure and moves on
             if self.progress:
                 self.progress.add_debug(f"ERROR: {str(e)}", error=True)
-                self.progress.add_debug("Press Enter to continue...", error=True)
-                time.sleep(0.1)
-                input()
             return False
\ No newline at end of file
@@ -7,18 +7,67 @@ class Config:
     # api keys
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
     
+    # content generation settings
+    OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL')  # e.g. a local stub server, None for the real api
+    OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-4o-mini')
+    OPENAI_TIMEOUT = 60
+    OPENAI_REQUESTS_PER_MINUTE = int(os.getenv('OPENAI_REQUESTS_PER_MINUTE', 500))
+    OPENAI_TOKENS_PER_MINUTE = int(os.getenv('OPENAI_TOKENS_PER_MINUTE', 200000))
+    CONTENT_CONCURRENCY = 16  # requests in flight at once
+    CONTENT_MAX_RETRIES = 5  # on 429, 5xx and dropped connections
+    CONTENT_MAX_TOKENS = 400  # completion budget per listing
+    CONTENT_CACHE_ENABLED = True  # reuse content generated for the same product under another item code
+    CONTENT_CACHE_MAX_ENTRIES = 100000
+    
+    # content backend: 'llm' writes every listing with the api, 'template' fills templates and
+    # only asks the api (when a key is set) for rows the templates flag as low-confidence
+    CONTENT_BACKEND = os.getenv('CONTENT_BACKEND', 'llm')
+    TITLE_TEMPLATE = "{name}"
+    DESCRIPTION_TEMPLATE = "{description}\n\nQuantity available: {quantity}\n\nTags: {keywords}"
+    TEMPLATE_KEYWORDS = 5  # keywords extracted per listing
+    TEMPLATE_MIN_WORDS = 2  # descriptions with fewer words are low-confidence
+    TEMPLATE_CHUNK_SIZE = 20000  # rows rendered per dataframe
+    
     # file paths
     DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
     
+    # database settings
+    DB_BUSY_TIMEOUT = 30  # seconds a writer waits for the lock
+    DB_CACHE_SIZE_KB = 65536  # page cache per connection
+    DB_CACHED_STATEMENTS = 256  # prepared statements kept per connection
+    
+    # posting queue settings
+    POSTING_LEASE_SECONDS = 600  # a claimed job goes back to the queue if its worker is silent this long
+    POSTING_MAX_ATTEMPTS = 3
+    POSTING_WORKERS = int(os.getenv('POSTING_WORKERS', 1))  # browsers posting in parallel, each on a copied profile
+    RUN_HEARTBEAT_SECONDS = 30  # how often a posting run marks itself alive
+    RUN_STALE_SECONDS = 120  # a running or paused run silent this long is treated as crashed and may be resumed
+    
     # marketplace settings
     MARKETPLACE_URL = "https://www.facebook.com/marketplace/create/item"
     
     # browser settings
     HEADLESS = False
     BROWSER_TIMEOUT = 30
-    BROWSER_WAIT_TIME = 5
+    FAST_FILL = True  # set text fields with one script call, typing only fields it couldn't set
+    PREWARM_CREATE_PAGE = True  # load the next listing's create page in a background tab while filling the current one
+    
+    # page waits: steps go on as soon as their condition holds, these only bound the wait
+    WAIT_POLL_INTERVAL = 0.1  # seconds between condition checks
+    PAGE_LOAD_TIMEOUT = 30  # document ready and the create form (or login popup) showing
+    ELEMENT_TIMEOUT = 10  # a form control becoming present or clickable
+    NETWORK_IDLE_MS = 500  # no new requests for this long counts as idle
+    NETWORK_IDLE_MAX_INFLIGHT = 2  # long-polling requests the page keeps open regardless
+    NETWORK_IDLE_TIMEOUT = 15  # e.g. a photo upload finishing
+    DOM_QUIET_MS = 150  # no dom mutations for this long counts as settled, e.g. a menu done animating
+    DOM_QUIET_TIMEOUT = 3
     USER_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'chrome_profile')
+    PROFILES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'chrome_profiles')  # per-worker copies
     
     # listing settings
     MAX_TITLE_LENGTH = 100
-    MAX_DESCRIPTION_LENGTH = 500 
\ No newline at end of file
+    MAX_DESCRIPTION_LENGTH = 500
+    
+    # image settings (normalized copies uploaded instead of the raw extracted images)
+    MAX_IMAGE_SIZE = 2048
+    IMAGE_QUALITY = 85 
\ No newline at end of file
@@ -1,21 +1,217 @@
-from openai import OpenAI
-from typing import Dict
+from openai import OpenAI, AsyncOpenAI, APIConnectionError, APIStatusError, RateLimitError
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from .config import Config
+from .utils.content_cache import ContentCache, content_key
+from .utils.rate_limiter import RateLimiter
+import asyncio
+import json
+import queue
+import random
+import threading
+
+# sentinel closing the result stream of a batch
+_DONE = object()
+
+# item fields the prompt is built from, and so the fields cached content is keyed by
+CONTENT_FIELDS = ('description', 'price')
+
+# bump whenever the prompt changes, so content cached for the old prompt is not reused
+PROMPT_VERSION = '1'
 
 class ContentGenerator:
-    def __init__(self):
-        self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
+    def __init__(self, cache: Optional[ContentCache] = None):
+        self.client = OpenAI(api_key=Config.OPENAI_API_KEY, base_url=Config.OPENAI_BASE_URL, timeout=Config.OPENAI_TIMEOUT)
+        self.cache = cache or (ContentCache() if Config.CONTENT_CACHE_ENABLED else None)
     
     def generate_listing_content(self, item_data: Dict) -> Dict:
-        """generate title and description using openai api"""
-        # placeholder for now - we'll implement the actual api call later
-        prompt = f"Create a marketplace listing title and description for: {item_data}"
+        """generate title and description using openai api, or reuse them from the cache"""
+        key = self._cache_key(item_data)
+        content = self.cache.get(key) if self.cache else None
+        if content is not None:
+            # not on an event loop, the hit can be recorded right away
+            self.cache.flush()
+            return content
         
         try:
-            # placeholder response
-            return {
-                "title": f"Generated title for {item_data.get('item_code', 'unknown')}",
-                "description": f"Generated description for {item_data.get('item_code', 'unknown')}"
-            }
+            response = self.client.chat.completions.create(
+                model=Config.OPENAI_MODEL,
+                messages=self._build_messages(item_data),
+                max_tokens=Config.CONTENT_MAX_TOKENS,
+                response_format={"type": "json_object"}
+            )
+            content = self._parse_content(response.choices[0].message.content)
         except Exception as e:
-            raise Exception(f"error generating content: {str(e)}") 
\ No newline at end of file
+            raise Exception(f"error generating content: {str(e)}")
+        
+        if self.cache:
+            self.cache.put(key, content, Config.OPENAI_MODEL)
+        return content
+    
+    def generate_batch(self, items: Iterable[Dict]) -> Iterator[Tuple[Dict, Optional[Dict], Optional[Exception]]]:
+        """generate content for many items concurrently, yielding (item, content, error) as each finishes
+        
+        requests run on an asyncio loop in a background thread, so the caller can keep
+        writing finished results to the database while the rest are still in flight
+        """
+        results = queue.Queue(maxsize=Config.CONTENT_CONCURRENCY * 4)
+        cancelled = threading.Event()
+        errors = []
+        
+        def run():
+            try:
+                asyncio.run(self._run_batch(iter(items), results, cancelled))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                if self.cache:
+                    # last_used of the batch's cache hits, written once instead of per lookup
+                    self.cache.flush()
+                    self.cache.db.close_connection()
+        
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        
+        done = False
+        try:
+            while not done:
+                result = results.get()
+                done = result is _DONE
+                if not done:
+                    yield result
+        finally:
+            # the caller may stop early, let in-flight requests finish and drop their results
+            cancelled.set()
+            while not done:
+                done = results.get() is _DONE
+            thread.join()
+        
+        if errors:
+            raise Exception(f"error generating content: {str(errors[0])}")
+    
+    async def _run_batch(self, items: Iterator[Dict], results: queue.Queue, cancelled: threading.Event):
+        """drain items with a fixed number of workers sharing one rate limiter"""
+        client = AsyncOpenAI(
+            api_key=Config.OPENAI_API_KEY,
+            base_url=Config.OPENAI_BASE_URL,
+            timeout=Config.OPENAI_TIMEOUT,
+            max_retries=0  # retries are ours, so they go through the rate limiter
+        )
+        limiter = RateLimiter(Config.OPENAI_REQUESTS_PER_MINUTE, Config.OPENAI_TOKENS_PER_MINUTE)
+        loop = asyncio.get_running_loop()
+        # requests in flight by cache key, so duplicates within a batch wait for the first one
+        in_flight: Dict[str, asyncio.Future] = {}
+        
+        async def generate(item: Dict) -> Dict:
+            key = self._cache_key(item)
+            content = self.cache.get(key) if self.cache else None
+            if content is not None:
+                return content
+            if key in in_flight:
+                return await asyncio.shield(in_flight[key])
+            
+            future = in_flight[key] = loop.create_future()
+            try:
+                content = await self._generate_async(client, limiter, item)
+                if self.cache:
+                    self.cache.put(key, content, Config.OPENAI_MODEL)
+                future.set_result(content)
+                return content
+            except Exception as e:
+                future.set_exception(e)
+                # nobody may be waiting, don't let asyncio warn about an unretrieved exception
+                future.exception()
+                raise
+            finally:
+                del in_flight[key]
+        
+        async def worker():
+            # items are pulled lazily, so a 20k item import never becomes 20k tasks
+            for item in items:
+                if cancelled.is_set():
+                    return
+                try:
+                    result = (item, await generate(item), None)
+                except Exception as e:
+                    result = (item, None, e)
+                # a full queue means the database writer is behind, wait for it off the loop
+                await loop.run_in_executor(None, results.put, result)
+        
+        try:
+            await asyncio.gather(*(worker() for _ in range(Config.CONTENT_CONCURRENCY)))
+        finally:
+            await client.close()
+            await loop.run_in_executor(None, results.put, _DONE)
+    
+    async def _generate_async(self, client: AsyncOpenAI, limiter: RateLimiter, item_data: Dict) -> Dict:
+        """one completion, retried with backoff on rate limits, server errors and dropped connections"""
+        messages = self._build_messages(item_data)
+        # roughly four characters per token, plus the whole completion budget
+        estimated = sum(len(message['content']) for message in messages) // 4 + Config.CONTENT_MAX_TOKENS
+        
+        for attempt in range(Config.CONTENT_MAX_RETRIES + 1):
+            await limiter.acquire(estimated)
+            try:
+                response = await client.chat.completions.create(
+                    model=Config.OPENAI_MODEL,
+                    messages=messages,
+                    max_tokens=Config.CONTENT_MAX_TOKENS,
+                    response_format={"type": "json_object"}
+                )
+                if response.usage is not None:
+                    limiter.settle(estimated, response.usage.total_tokens)
+                return self._parse_content(response.choices[0].message.content)
+            except (RateLimitError, APIStatusError, APIConnectionError) as e:
+                retryable = isinstance(e, (RateLimitError, APIConnectionError)) or e.status_code >= 500
+                if not retryable or attempt == Config.CONTENT_MAX_RETRIES:
+                    raise Exception(f"error generating content: {str(e)}")
+                
+                # exponential backoff with full jitter, unless the server says how long to wait
+                delay = self._retry_after(e) or random.uniform(0, min(60, 2 ** attempt))
+                if isinstance(e, RateLimitError):
+                    # everyone backs off, not just the request that hit the limit
+                    limiter.pause(delay)
+                await asyncio.sleep(delay)
+    
+    def _retry_after(self, error: Exception) -> Optional[float]:
+        """seconds the server asked us to wait, if it did"""
+        response = getattr(error, 'response', None)
+        if response is None:
+            return None
+        for header, scale in (('retry-after-ms', 0.001), ('retry-after', 1)):
+            try:
+                return float(response.headers[header]) * scale
+            except (KeyError, ValueError):
+                continue
+        return None
+    
+    def _cache_key(self, item_data: Dict) -> str:
+        """items with the same normalized prompt fields share generated content"""
+        return content_key({key: item_data.get(key) for key in CONTENT_FIELDS}, PROMPT_VERSION, Config.OPENAI_MODEL)
+    
+    def _build_messages(self, item_data: Dict) -> List[Dict]:
+        """chat messages asking for a json title and description"""
+        # only the keyed fields go into the prompt, anything else would make cached content wrong
+        details = {key: item_data.get(key) for key in CONTENT_FIELDS}
+        return [
+            {
+                "role": "system",
+                "content": (
+                    "You write furniture marketplace listings. Reply with a json object with the keys "
+                    f"\"title\" (at most {Config.MAX_TITLE_LENGTH} characters) and \"description\" "
+                    f"(at most {Config.MAX_DESCRIPTION_LENGTH} characters)."
+                )
+            },
+            {"role": "user", "content": json.dumps(details, default=str)}
+        ]
+    
+    def _parse_content(self, text: str) -> Dict:
+        """pull the title and description out of a completion, cut to the marketplace limits"""
+        content = json.loads(text)
+        title = str(content.get('title') or '').strip()
+        description = str(content.get('description') or '').strip()
+        if not title:
+            raise Exception("completion has no title")
+        return {
+            "title": title[:Config.MAX_TITLE_LENGTH],
+            "description": description[:Config.MAX_DESCRIPTION_LENGTH]
+        }
\ No newline at end of file
@@ -1,37 +1,84 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
+from .config import Config
 from .content_generator import ContentGenerator
+from .template_generator import TemplateContentGenerator
 from .browser_controller import BrowserController
 from .utils.db_handler import DatabaseHandler
 
 class ListingManager:
     def __init__(self):
         self.browser = BrowserController()
-        self.content_generator = ContentGenerator()
+        self.content_generator = self._create_content_generator()
         self.db = DatabaseHandler()
-        
+    
+    def _create_content_generator(self):
+        """pick the content backend named by Config.CONTENT_BACKEND"""
+        if Config.CONTENT_BACKEND == 'template':
+            # without an api key low-confidence rows keep their template content
+            return TemplateContentGenerator(ContentGenerator() if Config.OPENAI_API_KEY else None)
+        if Config.CONTENT_BACKEND == 'llm':
+            return ContentGenerator()
+        raise Exception(f"error creating content generator: unknown backend {Config.CONTENT_BACKEND}")
+    
     def get_current_listings(self) -> List[str]:
         """get list of current item codes from database"""
         return self.db.get_existing_listings()
+    
+    def find_changed_listings(self, items: List[Dict]) -> Dict[str, str]:
+        """get {item_code: 'insert' | 'update'} for items that are new or changed"""
+        return self.db.find_changed_listings(
+            (str(item['item_code']), item['fingerprint']) for item in items
+        )
+    
+    def build_listing_record(self, item_data: Dict, content: Optional[Dict] = None) -> Dict:
+        """generate content for an item, unless already generated, and return the row to store"""
+        if content is None:
+            content = self.content_generator.generate_listing_content(item_data)
+        return {
+            'item_code': str(item_data.get('item_code')),
+            'title': content['title'],
+            'description': content['description'],
+            'price': item_data.get('price', 0.0),
+            'fingerprint': item_data.get('fingerprint')
+        }
+    
+    def save_listings(self, items: List[Dict], chunk_size: Optional[int] = 500) -> Dict[str, int]:
+        """generate content for items concurrently and upsert them in bulk, return inserted/updated counts
         
+        records are written chunk by chunk as their content arrives, chunk_size=None
+        writes everything in a single transaction once all content is in
+        """
+        counts = {'inserted': 0, 'updated': 0}
+        records = []
+        for item_data, content, error in self.content_generator.generate_batch(items):
+            if error is not None:
+                print(f"Error creating listing {item_data.get('item_code')}: {str(error)}")
+                continue
+            records.append(self.build_listing_record(item_data, content))
+            if chunk_size and len(records) >= chunk_size:
+                self._add_counts(counts, self.db.upsert_listings(records, chunk_size=None))
+                records = []
+        
+        if records:
+            self._add_counts(counts, self.db.upsert_listings(records, chunk_size=None))
+        return counts
+    
+    def _add_counts(self, counts: Dict[str, int], chunk_counts: Dict[str, int]):
+        for key, value in chunk_counts.items():
+            counts[key] += value
+    
     def create_listing(self, item_data: Dict):
         """create new listing on marketplace"""
         try:
-            # generate content
-            content = self.content_generator.generate_listing_content(item_data)
-            
-            # save to database
-            self.db.add_listing(
-                item_code=item_data.get('item_code'),
-                title=content['title'],
-                description=content['description'],
-                price=item_data.get('price', 0.0)
-            )
+            # generate content and save to database
+            record = self.build_listing_record(item_data)
+            self.db.upsert_listings([record])
             
             # placeholder for creating listing
-            print(f"Creating listing for {item_data.get('item_code')}")
-            print(f"Title: {content['title']}")
-            print(f"Description: {content['description']}")
+            print(f"Creating listing for {record['item_code']}")
+            print(f"Title: {record['title']}")
+            print(f"Description: {record['description']}")
             print(f"Price: ${item_data.get('price', 0.0):.2f}")
-            
+        
         except Exception as e:
             print(f"Error creating listing: {str(e)}")
\ No newline at end of file
@@ -1,21 +1,58 @@
-from .utils.excel_handler import ExcelHandler
+from .utils.feed_readers import get_reader
+from .utils.listing_reader import fingerprint_listing
+from .utils.image_processor import ImageProcessor
 from .listing_manager import ListingManager
+from .batch_importer import BatchImporter
 from typing import List, Dict
 
+# rows staged into sqlite per new-item lookup
+INGEST_CHUNK_SIZE = 1000
+
 class MarketplaceBot:
     def __init__(self):
         self.listing_manager = ListingManager()
         
-    def process_excel_file(self, file_path: str):
-        """process excel file and create listings"""
-        # read excel file
-        excel_handler = ExcelHandler(file_path)
-        listings = excel_handler.read_listings()
+    def process_excel_file(self, file_path: str) -> Dict:
+        """process excel file and create or update listings, return the import diff and image summary"""
+        # stream rows from the file so work starts before the sheet is fully parsed
+        reader = get_reader(file_path)
+        listings = reader.iter_listings()
+        
+        # normalize images on all cores while rows keep streaming in
+        image_processor = ImageProcessor()
+        
+        diff = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        try:
+            chunk = []
+            for item in listings:
+                if isinstance(item.get('image'), str):
+                    image_processor.submit(item['image'], item['item_code'], item.get('image_hash'))
+                
+                item['fingerprint'] = fingerprint_listing(item)
+                chunk.append(item)
+                if len(chunk) >= INGEST_CHUNK_SIZE:
+                    self._process_chunk(chunk, diff)
+                    chunk = []
+            
+            if chunk:
+                self._process_chunk(chunk, diff)
+        finally:
+            diff['images'] = image_processor.close()
         
-        # get current listings
-        current_listings = self.listing_manager.get_current_listings()
+        return diff
+    
+    def process_excel_files(self, file_paths: List[str]) -> Dict:
+        """import every sheet of several excel files concurrently"""
+        return BatchImporter(self.listing_manager).import_files(file_paths)
+    
+    def _process_chunk(self, items: List[Dict], diff: Dict[str, int]):
+        """upsert the items of a chunk that sqlite reports as new or changed"""
+        # new-item detection runs as an anti-join inside sqlite
+        changed = self.listing_manager.find_changed_listings(items)
         
-        # process each item
-        for item in listings:
-            if item['item_code'] not in current_listings:
-                self.listing_manager.create_listing(item) 
\ No newline at end of file
+        # only new or changed rows are touched, written in one bulk transaction
+        to_save = [item for item in items if str(item['item_code']) in changed]
+        counts = self.listing_manager.save_listings(to_save)
+        diff['inserted'] += counts['inserted']
+        diff['updated'] += counts['updated']
+        diff['unchanged'] += len(items) - len(to_save)
\ No newline at end of file
@@ -0,0 +1,313 @@
+import os
+import shutil
+import threading
+import time
+from typing import Dict, List, Optional
+from .browser_controller import BrowserController
+from .config import Config
+from .utils.db_handler import DatabaseHandler
+from .utils.job_queue import PostingQueue
+from .utils.posting_journal import PostingJournal
+from .utils.posting_metrics import PostingMetrics, PhaseTimer
+
+# profile parts that are per-session, locked by a running chrome, or just cache
+PROFILE_IGNORE = shutil.ignore_patterns(
+    'Singleton*', 'lockfile', '*.lock', '*Cache', 'Crashpad', 'BrowserMetrics*', '*.tmp'
+)
+
+# stamp in a worker profile recording which state of the main profile it was copied from
+PROFILE_STAMP = '.copied_from'
+
+def prepare_worker_profile(index: int, workers: int) -> str:
+    """return the chrome profile directory for a worker
+    
+    a single worker uses Config.USER_DATA_DIR itself. with several, each gets a copy of it,
+    refreshed whenever the main profile was used since, so every window starts logged in.
+    """
+    if workers == 1:
+        return Config.USER_DATA_DIR
+    
+    profile_dir = os.path.join(Config.PROFILES_DIR, f"worker_{index}")
+    # chrome rewrites 'Local State' whenever it closes a profile
+    local_state = os.path.join(Config.USER_DATA_DIR, 'Local State')
+    source_state = str(os.path.getmtime(local_state)) if os.path.exists(local_state) else 'empty'
+    
+    stamp_path = os.path.join(profile_dir, PROFILE_STAMP)
+    try:
+        with open(stamp_path, 'r', encoding='utf-8') as f:
+            if f.read() == source_state:
+                return profile_dir
+    except OSError:
+        pass
+    
+    shutil.rmtree(profile_dir, ignore_errors=True)
+    if os.path.isdir(Config.USER_DATA_DIR):
+        shutil.copytree(Config.USER_DATA_DIR, profile_dir, ignore=PROFILE_IGNORE)
+    else:
+        os.makedirs(profile_dir)
+    with open(stamp_path, 'w', encoding='utf-8') as f:
+        f.write(source_state)
+    return profile_dir
+
+class PostingStopped(BaseException):
+    """raised in a worker at its next checkpoint once quitting was requested
+    
+    not an Exception, so the browser's own error handling can't swallow it on the way out
+    """
+
+class LeaseLost(BaseException):
+    """raised at a checkpoint when the job's lease ran out and another worker may hold it
+    
+    a BaseException like PostingStopped, the browser must not turn it into a plain failure
+    """
+
+class PostingControls:
+    """pause and quit shared by every posting worker, honoured between form phases"""
+    
+    def __init__(self):
+        self._running = threading.Event()
+        self._running.set()
+        self.stopping = False
+    
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set()
+    
+    def pause(self):
+        self._running.clear()
+    
+    def resume(self):
+        self._running.set()
+    
+    def stop(self):
+        """ask every worker to stop, paused ones wake up to do so"""
+        self.stopping = True
+        self._running.set()
+    
+    def check(self):
+        """block while paused, raise PostingStopped once stopping"""
+        self._running.wait()
+        if self.stopping:
+            raise PostingStopped()
+
+class WorkerProgress:
+    """a worker's view of the shared progress bar, tagging its debug lines and status"""
+    
+    def __init__(self, progress, name: str):
+        self.progress = progress
+        self.name = name
+    
+    def add_debug(self, message: str, error: bool = False):
+        if self.name:
+            message = f"{self.name}: {message}"
+        self.progress.add_debug(message, error)
+    
+    def set_status(self, status: str):
+        self.progress.set_worker_status(self.name or 'browser', status)
+    
+    def __getattr__(self, name):
+        return getattr(self.progress, name)
+
+class PostingWorker(threading.Thread):
+    """one browser posting the jobs it claims from the shared queue until it is drained"""
+    
+    def __init__(self, pool: 'PostingPool', index: int):
+        super().__init__(name=f"posting-worker-{index}", daemon=True)
+        self.pool = pool
+        self.index = index
+        self.progress = WorkerProgress(pool.progress, f"w{index + 1}" if pool.workers > 1 else '')
+        # each worker claims under its own id, so a lease taken over by a sibling is detected
+        self.queue = PostingQueue(pool.db, worker_id=f"{pool.run_id}-w{index}")
+        self.browser: Optional[BrowserController] = None
+        self.error: Optional[str] = None
+    
+    def run(self):
+        try:
+            self._run()
+        except PostingStopped:
+            self.progress.set_status("stopped")
+        except Exception as e:
+            self.error = str(e)
+            self.progress.add_debug(f"ERROR: {str(e)}", error=True)
+            self.progress.set_status(f"failed: {str(e)}")
+        finally:
+            if self.browser is not None:
+                self.browser.close()
+            self.pool.db.close_connection()
+    
+    def _step(self, description: str):
+        return self.progress.add_step(f"{description} ({self.progress.name})" if self.progress.name else description)
+    
+    def _run(self):
+        pool = self.pool
+        init_step = self._step("Initializing browser")
+        nav_step = self._step("Navigating to Facebook Marketplace")
+        login_step = self._step("Checking login status")
+        
+        # initialize browser on its own copy of the profile
+        self.progress.set_status("starting browser")
+        self.progress.start_step(init_step)
+        self.browser = BrowserController(user_data_dir=prepare_worker_profile(self.index, pool.workers))
+        self.browser.set_progress(self.progress)
+        if not self.browser.initialize_driver():
+            self.progress.complete_step(init_step, success=False)
+            raise Exception("failed to initialize browser")
+        self.progress.complete_step(init_step)
+        
+        # navigate to marketplace
+        self.progress.start_step(nav_step)
+        if not self.browser.navigate_to_marketplace():
+            self.progress.complete_step(nav_step, success=False)
+            raise Exception("failed to access marketplace")
+        self.progress.complete_step(nav_step)
+        
+        # check login status and wait if needed
+        self.progress.start_step(login_step)
+        self.progress.set_waiting(login_step)
+        if not self.browser.check_login_status():
+            self.progress.set_status("waiting for login")
+            while self.browser.driver.find_elements("id", "login_popup_cta_form"):
+                pool.controls.check()
+                time.sleep(0.5)
+        self.progress.complete_step(login_step)
+        
+        # claim jobs until the queue is drained, other workers and processes are claiming too
+        used_browser = False
+        while True:
+            pool.controls.check()
+            job = self.queue.claim()
+            if job is None:
+                self.progress.set_status("done")
+                return
+            used_browser = self._post_job(job, navigate=used_browser) or used_browser
+    
+    def _post_job(self, job: Dict, navigate: bool) -> bool:
+        """post one claimed job, recording its outcome in the queue, journal and metrics
+        
+        returns whether the browser was used, skipped jobs leave it where it is
+        """
+        pool = self.pool
+        
+        # an earlier attempt got as far as the publish click, never post it twice
+        if pool.journal.may_be_published(job['id']):
+            self.queue.complete(job['id'])
+            self.progress.add_debug(f"{job['item_code']} was published before the interruption, skipping")
+            pool.add_result(True)
+            return False
+        
+        step = self._step(f"Posting listing: {job['item_code']}")
+        pool.journal.record(pool.run_id, job, 'started')
+        timer = pool.metrics.timer(pool.run_id, job)
+        
+        def checkpoint(phase: str, timer: PhaseTimer = timer):
+            # time spent paused is not charged to any phase
+            timer.end()
+            self.progress.set_status(f"{job['item_code']}: {phase}")
+            # pausing and quitting are only honoured before the publish click
+            if phase != 'published':
+                pool.controls.check()
+                # a pause or a slow phase may have outlasted the lease, never carry on with a job
+                # another worker could be posting, least of all into the publish click
+                if not self.queue.renew(job['id']):
+                    raise LeaseLost(f"lease on {job['item_code']} expired")
+            pool.journal.record(pool.run_id, job, phase)
+            if phase != 'published':
+                timer.begin('publish' if phase == 'publishing' else phase)
+        
+        try:
+            # navigate back to marketplace for all posts except the worker's first one
+            if navigate:
+                timer.begin('navigate')
+                self.progress.set_status(f"{job['item_code']}: navigate")
+                self.progress.add_debug("navigating back to marketplace...")
+                if not self.browser.navigate_to_marketplace():
+                    raise Exception("failed to navigate back to marketplace")
+                self.progress.add_debug("navigation successful")
+            
+            # start the posting step
+            self.progress.start_step(step)
+            self.progress.add_debug(f"starting to post listing {job['item_code']} (attempt {job['attempts']})...")
+            
+            if not self.browser.post_listing(
+                title=job['title'],
+                description=job['description'],
+                price=job['price'],
+                item_code=job['item_code'],
+                progress=self.progress,
+                checkpoint=checkpoint
+            ):
+                raise Exception("failed to post listing")
+            
+            timer.finish(success=True)
+            if not self.queue.complete(job['id']):
+                self.progress.add_debug(f"lease on {job['item_code']} was lost before it completed")
+            self.progress.complete_step(step)
+            pool.add_result(True)
+        
+        except PostingStopped:
+            # the job in hand goes straight back to the queue
+            timer.finish(success=False)
+            pool.journal.record(pool.run_id, job, 'released')
+            self.queue.release(job['id'])
+            self.progress.complete_step(step, success=False)
+            raise
+        except LeaseLost as e:
+            # the job is someone else's now: its journal, queue row and result are theirs to record
+            timer.finish(success=False)
+            self.progress.add_debug(f"{str(e)}, leaving it to the worker that took it over", error=True)
+            self.progress.complete_step(step, success=False)
+        except Exception as e:
+            timer.finish(success=False)
+            pool.journal.record(pool.run_id, job, 'failed')
+            # past the publish click the listing may be live, a retry could post it twice
+            self.queue.fail(job['id'], str(e), retry=not pool.journal.may_be_published(job['id']))
+            self.progress.complete_step(step, success=False)
+            pool.add_result(False)
+        return True
+
+class PostingPool:
+    """drains the posting queue of a run with several browsers at once
+    
+    every worker has its own chrome profile and browser but they share the queue, so
+    a job is only ever claimed by one of them, plus the run's journal and metrics
+    """
+    
+    def __init__(self, db: DatabaseHandler, run_id: str, progress, workers: int = Config.POSTING_WORKERS):
+        self.db = db
+        self.run_id = run_id
+        self.progress = progress
+        self.workers = max(1, workers)
+        # workers claim as '<run id>-w<n>', so a resumed run can hand back its old claims
+        self.queue = PostingQueue(db, worker_id=run_id)
+        self.journal = PostingJournal(db)
+        self.metrics = PostingMetrics(db)
+        self.controls = PostingControls()
+        self.counts = {'posted': 0, 'failed': 0}
+        self._counts_lock = threading.Lock()
+        self._threads: List[PostingWorker] = []
+    
+    def add_result(self, success: bool):
+        with self._counts_lock:
+            self.counts['posted' if success else 'failed'] += 1
+    
+    def start(self):
+        """start one thread per worker"""
+        self._threads = [PostingWorker(self, index) for index in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+    
+    def is_alive(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+    
+    def stop(self):
+        """stop at every worker's next checkpoint, releasing the jobs they hold"""
+        self.controls.stop()
+    
+    def join(self):
+        for thread in self._threads:
+            thread.join()
+    
+    @property
+    def errors(self) -> List[str]:
+        """errors that ended workers early"""
+        return [thread.error for thread in self._threads if thread.error]
\ No newline at end of file
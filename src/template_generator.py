@@ -0,0 +1,191 @@
+from string import Formatter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .config import Config
+import numpy as np
+import pandas as pd
+
+# words that never make a useful keyword
+STOPWORDS = frozenset("""
+    a an and are as at be by for from has have in is it its of on or the this to with without
+    new used set pcs pc piece pieces item items size color colour x
+""".split())
+
+# fields a title or description template can use
+TEMPLATE_FIELDS = ('name', 'description', 'keywords', 'price', 'quantity', 'item_code')
+
+def truncate_words(text: pd.Series, limit: int, ellipsis: str = '') -> pd.Series:
+    """cut strings longer than limit at the last word boundary that fits, ellipsis included"""
+    too_long = text.str.len() > limit
+    if not too_long.any():
+        return text
+    
+    cut = text[too_long].str.slice(0, limit - len(ellipsis) + 1)
+    # drop the partial last word (the extra character tells whether it was complete) and dangling punctuation
+    trimmed = cut.str.replace(r'\s+\S*$', '', regex=True).str.rstrip(' ,;:-')
+    # a single word longer than the limit is cut hard
+    trimmed = trimmed.where(trimmed.str.len() > 0, cut.str.slice(0, limit - len(ellipsis)))
+    
+    result = text.copy()
+    result[too_long] = trimmed.str.slice(0, limit - len(ellipsis)) + ellipsis
+    return result
+
+def truncate_words_each(text: pd.Series, limits: pd.Series, ellipsis: str = '') -> pd.Series:
+    """truncate_words with a limit per row, applied once per distinct limit"""
+    too_long = text.str.len() > limits
+    if not too_long.any():
+        return text
+    result = text.copy()
+    for limit, rows in limits[too_long].groupby(limits[too_long]).groups.items():
+        # no room for even the ellipsis, the field is left out
+        result[rows] = truncate_words(text[rows], int(limit), ellipsis) if limit > len(ellipsis) else ''
+    return result
+
+def render_template(template: str, fields: Dict[str, pd.Series], index: pd.Index) -> pd.Series:
+    """fill a str.format style template column-wise, format specs are not supported"""
+    result = pd.Series('', index=index, dtype=object)
+    for literal, field, _, _ in Formatter().parse(template):
+        if literal:
+            result = result + literal
+        if field is not None:
+            if field not in fields:
+                raise Exception(f"error rendering template: unknown field {{{field}}}, use one of {', '.join(TEMPLATE_FIELDS)}")
+            result = result + fields[field]
+    return result
+
+class TemplateContentGenerator:
+    """deterministic titles and descriptions built for a whole dataframe at once
+    
+    rows the templates can't do justice (no usable description, no price) are flagged
+    low-confidence and, when a fallback generator is set, handed to it instead
+    """
+    
+    def __init__(self, fallback=None, title_template: str = None, description_template: str = None,
+                 chunk_size: int = Config.TEMPLATE_CHUNK_SIZE):
+        self.fallback = fallback
+        self.title_template = title_template or Config.TITLE_TEMPLATE
+        self.description_template = description_template or Config.DESCRIPTION_TEMPLATE
+        self.chunk_size = chunk_size
+        self.stats = {'template': 0, 'fallback': 0}
+    
+    def generate_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """return title, description, keywords, low_confidence and reason columns for df's rows"""
+        # work on positions, the caller's index may not be unique
+        index = df.index
+        df = df.reset_index(drop=True)
+        description = self._column(df, 'description').fillna('').astype(str)
+        description = description.str.replace(r'\s+', ' ', regex=True).str.strip()
+        price = pd.to_numeric(self._column(df, 'price'), errors='coerce')
+        quantity = pd.to_numeric(self._column(df, 'quantity'), errors='coerce')
+        
+        # the name is the first clause of the description, title-cased unless it has its own casing
+        name = description.str.replace(r'(\s*[,;:(|]|\s+-\s).*$', '', regex=True).str.strip(' .')
+        uniform_case = name.str.islower() | name.str.isupper()
+        name = name.where(~uniform_case, name.str.title())
+        description = description.str.slice(0, 1).str.upper() + description.str.slice(1)
+        
+        keywords = self._keywords(description, Config.TEMPLATE_KEYWORDS)
+        fields = {
+            'name': name,
+            'description': description,
+            'keywords': keywords,
+            'price': price.round(2).map('{:.2f}'.format),
+            'quantity': quantity.fillna(1).clip(lower=1).astype(int).astype(str),
+            'item_code': self._column(df, 'item_code').astype(str)
+        }
+        
+        title = render_template(self.title_template, fields, df.index).str.strip()
+        # the description gets whatever the rest of the template leaves, so the quantity and tags
+        # after it are never cut off. cleaning the body up below only makes it shorter
+        rest = render_template(self.description_template, {**fields, 'description': pd.Series('', index=df.index)}, df.index)
+        room = (Config.MAX_DESCRIPTION_LENGTH - rest.str.len()).clip(lower=0)
+        fields['description'] = truncate_words_each(description, room, ellipsis='...')
+        body = render_template(self.description_template, fields, df.index)
+        body = body.str.replace(r'\n{3,}', '\n\n', regex=True).str.strip()
+        
+        # first matching reason wins, rows without one are confident
+        words = description.str.count(r'[^\W\d_]{2,}')
+        reason = np.select(
+            [
+                description.str.len() == 0,
+                words < Config.TEMPLATE_MIN_WORDS,
+                name.str.len() < 3,
+                price.isna() | (price <= 0),
+                keywords == ''
+            ],
+            ['no description', 'too few words', 'no usable name', 'no price', 'no keywords'],
+            default=''
+        )
+        
+        result = pd.DataFrame({
+            'title': truncate_words(title, Config.MAX_TITLE_LENGTH),
+            # only bites for templates using {description} more than once
+            'description': truncate_words(body, Config.MAX_DESCRIPTION_LENGTH, ellipsis='...'),
+            'keywords': keywords,
+            'low_confidence': reason != '',
+            'reason': reason
+        })
+        result.index = index
+        return result
+    
+    def generate_listing_content(self, item_data: Dict) -> Dict:
+        """generate title and description for one item"""
+        row = self.generate_frame(pd.DataFrame([item_data])).iloc[0]
+        if row['low_confidence'] and self.fallback is not None:
+            self.stats['fallback'] += 1
+            return self.fallback.generate_listing_content(item_data)
+        if not row['title']:
+            raise Exception(f"error generating content: template gave no title ({row['reason']})")
+        self.stats['template'] += 1
+        return {'title': row['title'], 'description': row['description']}
+    
+    def generate_batch(self, items: Iterable[Dict]) -> Iterator[Tuple[Dict, Optional[Dict], Optional[Exception]]]:
+        """yield (item, content, error) like ContentGenerator.generate_batch, templates first
+        
+        items are rendered chunk_size at a time, low-confidence ones are collected and
+        sent to the fallback generator in one concurrent batch at the end
+        """
+        low_confidence = []
+        chunk = []
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= self.chunk_size:
+                yield from self._generate_chunk(chunk, low_confidence)
+                chunk = []
+        if chunk:
+            yield from self._generate_chunk(chunk, low_confidence)
+        
+        if low_confidence:
+            self.stats['fallback'] += len(low_confidence)
+            yield from self.fallback.generate_batch(low_confidence)
+    
+    def _generate_chunk(self, chunk: List[Dict], low_confidence: List[Dict]):
+        frame = self.generate_frame(pd.DataFrame.from_records(chunk, columns=['item_code', 'description', 'quantity', 'price']))
+        for item, title, description, low, reason in zip(
+                chunk, frame['title'], frame['description'], frame['low_confidence'], frame['reason']):
+            if low and self.fallback is not None:
+                low_confidence.append(item)
+                continue
+            # like an empty completion, nothing worth saving
+            if not title:
+                yield item, None, Exception(f"template gave no title ({reason})")
+                continue
+            self.stats['template'] += 1
+            yield item, {'title': title, 'description': description}, None
+    
+    def _column(self, df: pd.DataFrame, name: str) -> pd.Series:
+        return df[name] if name in df.columns else pd.Series(np.nan, index=df.index, dtype=object)
+    
+    def _keywords(self, description: pd.Series, limit: int) -> pd.Series:
+        """the first distinct non-stopword words of each description, comma separated"""
+        words = description.str.lower().str.findall(r'[^\W\d_][\w-]{2,}').explode().dropna()
+        words = words[~words.isin(STOPWORDS)].rename('word').rename_axis('row').reset_index()
+        # de-duplicate within a row, keeping first occurrences in order
+        words = words.drop_duplicates()
+        words['rank'] = words.groupby('row').cumcount()
+        # one column per keyword position, joined column by column instead of row by row
+        columns = words[words['rank'] < limit].set_index(['row', 'rank'])['word'].unstack()
+        keywords = pd.Series('', index=description.index, dtype=object)
+        for position in columns.columns:
+            separator = ', ' if position else ''
+            keywords = keywords + (separator + columns[position]).reindex(description.index).fillna('').astype(object)
+        return keywords
\ No newline at end of file
@@ -1,12 +1,18 @@
 import curses
 import os
-from typing import List, Dict, Callable
+from typing import List, Optional
 from datetime import datetime
 from ..utils.db_handler import DatabaseHandler
 from ..marketplace_bot import MarketplaceBot
-from ..browser_controller import BrowserController
+from ..posting_pool import PostingPool
 import time
 from ..utils.progress_bar import ProgressBar
+from ..utils.feed_readers import SUPPORTED_EXTENSIONS
+from ..utils.listing_pager import ListingPager
+from ..utils.listing_selection import ListingSelection
+from ..utils.job_queue import PostingQueue
+from ..utils.posting_journal import PostingJournal
+from ..config import Config
 
 class MenuUI:
     def __init__(self):
@@ -14,7 +20,10 @@ class MenuUI:
         self.bot = MarketplaceBot()
         
     def start(self):
-        curses.wrapper(self.main_menu)
+        try:
+            curses.wrapper(self.main_menu)
+        finally:
+            DatabaseHandler.close_all()
     
     def main_menu(self, stdscr):
         # setup colors
@@ -33,7 +42,8 @@ class MenuUI:
             "1. Process New Excel File",
             "2. View Database Listings",
             "3. Post Pending Listings",
-            "4. Exit"
+            "4. Resume Last Run",
+            "5. Exit"
         ]
         
         while True:
@@ -46,10 +56,7 @@ class MenuUI:
             stdscr.hline(2, 0, '-', width)
             
             # status section
-            with self.db.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT status, COUNT(*) FROM listings GROUP BY status")
-                stats = dict(cursor.fetchall())
+            stats = self.db.get_status_counts()
             
             stdscr.addstr(4, 2, "Database Status:", curses.A_BOLD)
             stdscr.addstr(5, 4, f"Pending: {stats.get('pending', 0)}", curses.color_pair(2))
@@ -67,7 +74,7 @@ class MenuUI:
             
             # help section
             stdscr.hline(14, 0, '-', width)
-            stdscr.addstr(15, 2, "Navigate: ↑/↓ or [1-4] Select Option | Enter or [q] Quit", curses.color_pair(4))
+            stdscr.addstr(15, 2, "Navigate: ↑/↓ or [1-5] Select Option | Enter or [q] Quit", curses.color_pair(4))
             
             # handle input
             choice = stdscr.getch()
@@ -85,9 +92,11 @@ class MenuUI:
                     self.view_database(stdscr)
                 elif current_selection == 2:
                     self.post_listings(stdscr)
-            elif choice in [ord('1'), ord('2'), ord('3'), ord('4')]:
+                elif current_selection == 3:
+                    self.resume_last_run(stdscr)
+            elif choice in [ord('1'), ord('2'), ord('3'), ord('4'), ord('5')]:
                 selection = choice - ord('1')
-                if selection == 3:  # Exit option
+                if selection == 4:  # Exit option
                     break
                 elif selection == 0:
                     self.select_excel_file(stdscr)
@@ -95,6 +104,8 @@ class MenuUI:
                     self.view_database(stdscr)
                 elif selection == 2:
                     self.post_listings(stdscr)
+                elif selection == 3:
+                    self.resume_last_run(stdscr)
             elif choice == ord('q'):
                 break
     
@@ -103,10 +114,10 @@ class MenuUI:
         stdscr.keypad(True)
         
         data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data')
-        excel_files = [f for f in os.listdir(data_dir) if f.endswith('.xlsx')]
+        excel_files = [f for f in os.listdir(data_dir) if f.lower().endswith(SUPPORTED_EXTENSIONS)]
         
         if not excel_files:
-            self.show_message(stdscr, "No Excel files found in data directory!", error=True)
+            self.show_message(stdscr, "No Excel, CSV or Parquet files found in data directory!", error=True)
             return
             
         current_selection = 0
@@ -128,7 +139,7 @@ class MenuUI:
             
             # help text
             stdscr.hline(height-2, 0, '-', width)
-            stdscr.addstr(height-1, 2, "↑/↓: Navigate | Enter: Select | q: Back", curses.color_pair(4))
+            stdscr.addstr(height-1, 2, "↑/↓: Navigate | Enter: Select | b: Import All | q: Back", curses.color_pair(4))
             
             key = stdscr.getch()
             
@@ -140,15 +151,24 @@ class MenuUI:
                 selected_file = os.path.join(data_dir, excel_files[current_selection])
                 self.process_excel_file(stdscr, selected_file)
                 break
+            elif key == ord('b'):  # batch import every workbook
+                self.process_excel_files(stdscr, [os.path.join(data_dir, f) for f in excel_files])
+                break
             elif key == ord('q'):
                 break
     
     def view_database(self, stdscr):
-        page = 0
-        items_per_page = 15
-        
+        pager = ListingPager(self.db, page_size=15)
+        try:
+            self._view_database(stdscr, pager)
+        finally:
+            pager.close()
+    
+    def _view_database(self, stdscr, pager: ListingPager):
         while True:
-            stdscr.clear()
+            # served from the page window unless listings changed
+            pager.refresh()
+            stdscr.erase()
             height, width = stdscr.getmaxyx()
             
             # header
@@ -162,56 +182,112 @@ class MenuUI:
             stdscr.addstr(2, width - 15, "Created", curses.A_BOLD)
             stdscr.hline(3, 0, '-', width)
             
-            # get data
-            with self.db.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM listings")
-                total_items = cursor.fetchone()[0]
-                
-                cursor.execute("""
-                    SELECT item_code, description, status, created_at 
-                    FROM listings 
-                    ORDER BY created_at DESC
-                    LIMIT ? OFFSET ?
-                """, (items_per_page, page * items_per_page))
-                listings = cursor.fetchall()
-            
             # show listings
-            for idx, listing in enumerate(listings):
+            for idx, listing in enumerate(pager.rows):
                 y_pos = idx + 4
                 if y_pos < height - 3:
-                    status_color = curses.color_pair(1) if listing[2] == 'posted' else curses.color_pair(2)
-                    created_date = datetime.strptime(listing[3], '%Y-%m-%d %H:%M:%S').strftime('%Y-%m-%d')
+                    status_color = curses.color_pair(1) if listing['status'] == 'posted' else curses.color_pair(2)
+                    created_date = datetime.strptime(listing['created_at'], '%Y-%m-%d %H:%M:%S').strftime('%Y-%m-%d')
                     
-                    stdscr.addstr(y_pos, 2, f"{listing[0][:10]}")
-                    stdscr.addstr(y_pos, 15, f"{listing[1][:50]}...")
-                    stdscr.addstr(y_pos, width - 25, f"[{listing[2]}]", status_color)
+                    stdscr.addstr(y_pos, 2, f"{listing['item_code'][:10]}")
+                    stdscr.addstr(y_pos, 15, f"{listing['description'][:50]}...")
+                    stdscr.addstr(y_pos, width - 25, f"[{listing['status']}]", status_color)
                     stdscr.addstr(y_pos, width - 15, created_date)
             
             # footer
             stdscr.hline(height-2, 0, '-', width)
-            page_info = f"Page {page + 1}/{(total_items + items_per_page - 1) // items_per_page}"
-            stdscr.addstr(height-1, 2, f"↑/↓: Navigate | q: Back | {page_info}", curses.color_pair(4))
+            page_info = f"Page {pager.page + 1}/{pager.page_count}"
+            stdscr.addstr(height-1, 2, f"↑/↓: Navigate | /: Search | q: Back | {page_info}", curses.color_pair(4))
             
             key = stdscr.getch()
             if key == ord('q'):
                 break
-            elif key == curses.KEY_DOWN and (page + 1) * items_per_page < total_items:
-                page += 1
-            elif key == curses.KEY_UP and page > 0:
-                page -= 1
+            elif key == curses.KEY_DOWN:
+                pager.next_page()
+            elif key == curses.KEY_UP:
+                pager.prev_page()
+            elif key == ord('/'):
+                self.search_database(stdscr)
+    
+    def search_database(self, stdscr):
+        """incremental full-text search, results narrow with every key typed"""
+        query = ""
+        results = []
+        total = 0
+        elapsed_ms = 0.0
+        searched = None
+        
+        while True:
+            height, width = stdscr.getmaxyx()
+            
+            # only hit the index when the text changed
+            if query != searched:
+                start_time = time.perf_counter()
+                results = self.db.search_listings(query, limit=max(height - 9, 1))
+                # the list is cut to the screen, the total is counted separately
+                total = self.db.count_search_matches(query) if results else 0
+                elapsed_ms = (time.perf_counter() - start_time) * 1000
+                searched = query
+            
+            stdscr.erase()
+            
+            # header
+            stdscr.addstr(0, 0, "Search Listings", curses.A_BOLD | curses.color_pair(3))
+            stdscr.hline(1, 0, '-', width)
+            stdscr.addstr(2, 2, f"Search: {query}", curses.A_BOLD)
+            
+            # column headers
+            stdscr.addstr(4, 2, "Item Code", curses.A_BOLD)
+            stdscr.addstr(4, 15, "Title", curses.A_BOLD)
+            stdscr.addstr(4, 50, "Description", curses.A_BOLD)
+            stdscr.addstr(4, width - 15, "Status", curses.A_BOLD)
+            stdscr.hline(5, 0, '-', width)
+            
+            # show matches, best first
+            for idx, listing in enumerate(results):
+                y_pos = idx + 6
+                if y_pos < height - 3:
+                    status_color = curses.color_pair(1) if listing['status'] == 'posted' else curses.color_pair(2)
+                    stdscr.addstr(y_pos, 2, f"{listing['item_code'][:10]}")
+                    stdscr.addstr(y_pos, 15, f"{(listing['title'] or '')[:32]}")
+                    stdscr.addstr(y_pos, 50, f"{(listing['description'] or '')[:max(width - 68, 0)]}")
+                    stdscr.addstr(y_pos, width - 15, f"[{listing['status']}]", status_color)
+            
+            # footer
+            stdscr.hline(height-2, 0, '-', width)
+            footer = f"showing {len(results)} of {total} matches in {elapsed_ms:.1f} ms | Type to search | Backspace: Delete | Esc: Back"
+            stdscr.addstr(height-1, 2, footer[:width-3], curses.color_pair(4))
+            
+            key = stdscr.getch()
+            if key == 27:  # Esc
+                break
+            elif key in [curses.KEY_BACKSPACE, 127, 8]:
+                query = query[:-1]
+            elif 32 <= key < 127:
+                query += chr(key)
     
     def post_listings(self, stdscr):
-        page = 0
-        items_per_page = 15
-        selected_items = set()
+        pager = ListingPager(self.db, status='pending', page_size=15)
+        selection = ListingSelection(self.db, status='pending')
+        try:
+            self._post_listings(stdscr, pager, selection)
+        finally:
+            selection.close()
+            pager.close()
+    
+    def _post_listings(self, stdscr, pager: ListingPager, selection: ListingSelection):
+        selected_count = None
         current_selection = 0
         
         # enable keypad mode
         stdscr.keypad(True)
         
         while True:
-            stdscr.clear()
+            # served from the page window unless listings changed
+            if pager.refresh():
+                current_selection = min(current_selection, max(len(pager.rows) - 1, 0))
+                selected_count = None
+            stdscr.erase()
             height, width = stdscr.getmaxyx()
             
             # header
@@ -227,27 +303,15 @@ class MenuUI:
             stdscr.addstr(2, width - 15, "Created", curses.A_BOLD)
             stdscr.hline(3, 0, '-', width)
             
-            # get pending listings
-            with self.db.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM listings WHERE status = 'pending'")
-                total_items = cursor.fetchone()[0]
-                
-                cursor.execute("""
-                    SELECT item_code, title, description, price, created_at 
-                    FROM listings 
-                    WHERE status = 'pending'
-                    ORDER BY created_at DESC
-                    LIMIT ? OFFSET ?
-                """, (items_per_page, page * items_per_page))
-                listings = cursor.fetchall()
+            listings = pager.rows
+            selected_on_page = selection.selected_codes([listing['item_code'] for listing in listings])
             
             # show listings
             for idx, listing in enumerate(listings):
                 y_pos = idx + 4
                 if y_pos < height - 3:
                     # arrow and checkbox
-                    checkbox = "[X]" if listing[0] in selected_items else "[ ]"
+                    checkbox = "[X]" if listing['item_code'] in selected_on_page else "[ ]"
                     if idx == current_selection:
                         stdscr.addstr(y_pos, 0, "-> ", curses.A_BOLD | curses.color_pair(1))
                         stdscr.addstr(y_pos, 2, checkbox, curses.A_BOLD | curses.color_pair(1))
@@ -255,13 +319,13 @@ class MenuUI:
                         stdscr.addstr(y_pos, 2, checkbox)
                     
                     # listing details
-                    created_date = datetime.strptime(listing[4], '%Y-%m-%d %H:%M:%S').strftime('%Y-%m-%d')
-                    price_str = f"${listing[3]:.2f}" if listing[3] else "N/A"
+                    created_date = datetime.strptime(listing['created_at'], '%Y-%m-%d %H:%M:%S').strftime('%Y-%m-%d')
+                    price_str = f"${listing['price']:.2f}" if listing['price'] else "N/A"
                     
                     # truncate strings to fit
-                    item_code = listing[0][:10]
-                    title = listing[1][:20] + "..." if len(listing[1]) > 20 else listing[1]
-                    description = listing[2][:30] + "..." if len(listing[2]) > 30 else listing[2]
+                    item_code = listing['item_code'][:10]
+                    title = listing['title'][:20] + "..." if len(listing['title']) > 20 else listing['title']
+                    description = listing['description'][:30] + "..." if len(listing['description']) > 30 else listing['description']
                     
                     stdscr.addstr(y_pos, 7, item_code)
                     stdscr.addstr(y_pos, 20, title)
@@ -271,10 +335,11 @@ class MenuUI:
             
             # footer
             stdscr.hline(height-3, 0, '-', width)
-            selected_count = len(selected_items)
-            status_line = f"Selected: {selected_count} | Page {page + 1}/{(total_items + items_per_page - 1) // items_per_page}"
-            stdscr.addstr(height-2, 2, status_line, curses.color_pair(3))
-            stdscr.addstr(height-1, 2, "↑/↓: Navigate | ←/→: Change Page | Space: Select | Enter: Post | a: Select All | q: Back", 
+            if selected_count is None:  # only recounted after the selection or listings change
+                selected_count = selection.count()
+            status_line = f"Selected: {selected_count} ({selection.describe()}) | Page {pager.page + 1}/{pager.page_count}"
+            stdscr.addstr(height-2, 2, status_line[:width-3], curses.color_pair(3))
+            stdscr.addstr(height-1, 2, "↑/↓: Navigate | ←/→: Page | Space: Select | Enter: Post | a: All | f: Filter | c: Clear | q: Back"[:width-3],
                          curses.color_pair(4))
             
             # handle input
@@ -286,47 +351,74 @@ class MenuUI:
                 if key == curses.KEY_UP:
                     if current_selection > 0:
                         current_selection -= 1
-                    elif page > 0:  # if at top of page, go to previous page
-                        page -= 1
-                        current_selection = items_per_page - 1
+                    elif pager.prev_page():  # if at top of page, go to previous page
+                        current_selection = len(pager.rows) - 1
                 elif key == curses.KEY_DOWN:
                     if current_selection < len(listings) - 1:
                         current_selection += 1
-                    elif (page + 1) * items_per_page < total_items:  # if at bottom of page, go to next page
-                        page += 1
+                    elif pager.next_page():  # if at bottom of page, go to next page
                         current_selection = 0
-                elif key == curses.KEY_LEFT and page > 0:  # previous page
-                    page -= 1
+                elif key == curses.KEY_LEFT and pager.prev_page():  # previous page
                     current_selection = 0
-                elif key == curses.KEY_RIGHT and (page + 1) * items_per_page < total_items:  # next page
-                    page += 1
+                elif key == curses.KEY_RIGHT and pager.next_page():  # next page
                     current_selection = 0
             elif key == ord(' '):  # Space to toggle selection
                 if current_selection < len(listings):
-                    item_code = listings[current_selection][0]
-                    if item_code in selected_items:
-                        selected_items.remove(item_code)
-                    else:
-                        selected_items.add(item_code)
+                    selection.toggle(listings[current_selection]['item_code'])
+                    selected_count = None
                     # move to next item after selection
                     if current_selection < len(listings) - 1:
                         current_selection += 1
-            elif key == ord('a'):  # Select all on current page
-                for listing in listings:
-                    selected_items.add(listing[0])
-            elif key == ord('\n') and selected_items:  # Enter to post selected
-                if self.confirm_post_selected(stdscr, len(selected_items)):
-                    self.post_selected_listings(stdscr, selected_items)
+            elif key == ord('a'):  # Select all pending listings
+                selection.select_all()
+                selected_count = None
+            elif key == ord('f'):  # Select pending listings by price and date
+                self.prompt_selection_filter(stdscr, selection)
+                selected_count = None
+            elif key == ord('c'):  # Clear selection
+                selection.clear()
+                selected_count = None
+            elif key == ord('\n') and selected_count:  # Enter to post selected
+                if self.confirm_post_selected(stdscr, selected_count):
+                    self.post_selected_listings(stdscr, selection)
                     break
             elif key == curses.KEY_NPAGE:  # Page Down
-                if (page + 1) * items_per_page < total_items:
-                    page += 1
+                if pager.next_page():
                     current_selection = 0
             elif key == curses.KEY_PPAGE:  # Page Up
-                if page > 0:
-                    page -= 1
+                if pager.prev_page():
                     current_selection = 0
 
+    def prompt(self, stdscr, label: str) -> str:
+        """read a line of text at the bottom of the screen"""
+        height, width = stdscr.getmaxyx()
+        stdscr.move(height-1, 0)
+        stdscr.clrtoeol()
+        stdscr.addstr(height-1, 2, label, curses.color_pair(3))
+        curses.echo()
+        curses.curs_set(1)
+        try:
+            return stdscr.getstr(height-1, 2 + len(label), 30).decode('utf-8', 'ignore').strip()
+        finally:
+            curses.noecho()
+            curses.curs_set(0)
+    
+    def prompt_selection_filter(self, stdscr, selection: ListingSelection):
+        """ask for a price range and creation date and select the pending listings matching them"""
+        try:
+            min_price = self.prompt(stdscr, "Min price (blank for none): ")
+            max_price = self.prompt(stdscr, "Max price (blank for none): ")
+            created_after = self.prompt(stdscr, "Created after YYYY-MM-DD (blank for any): ")
+            if created_after:
+                datetime.strptime(created_after, '%Y-%m-%d')
+            selection.select_all(
+                min_price=float(min_price) if min_price else None,
+                max_price=float(max_price) if max_price else None,
+                created_after=created_after or None
+            )
+        except ValueError as e:
+            self.show_message(stdscr, f"Invalid filter: {str(e)}", error=True)
+    
     def confirm_post_selected(self, stdscr, count: int) -> bool:
         height, width = stdscr.getmaxyx()
         stdscr.clear()
@@ -342,10 +434,34 @@ class MenuUI:
             if choice in [ord('n'), ord('N')]:
                 return False
 
-    def post_selected_listings(self, stdscr, selected_items: set):
+    def resume_last_run(self, stdscr):
+        """pick up the most recent posting run that crashed or was quit"""
+        journal = PostingJournal(self.db)
+        run = journal.get_resumable_run()
+        if run is None:
+            self.show_message(stdscr, "No interrupted posting run to resume")
+            return
+        
+        remaining = PostingQueue(self.db).remaining()
+        if not remaining:
+            journal.set_run_status(run['id'], 'finished')
+            self.show_message(stdscr, "Nothing left to post, the last run is complete")
+            return
+        
+        if self.confirm_post_selected(stdscr, remaining):
+            # another process may have picked the run up while we were asking
+            if not journal.take_over_run(run['id']):
+                self.show_message(stdscr, "That run was resumed elsewhere in the meantime")
+                return
+            self.post_selected_listings(stdscr, run_id=run['id'])
+    
+    def post_selected_listings(self, stdscr, selection: Optional[ListingSelection] = None, run_id: Optional[str] = None):
+        """post a selection as a new journaled run, or resume the run run_id"""
         start_time = time.time()
         success_count = 0
         failed_count = 0
+        total_count = 0
+        run_status = 'interrupted'
         
         try:
             stdscr.clear()
@@ -356,113 +472,80 @@ class MenuUI:
             
             # show controls
             height, width = stdscr.getmaxyx()
-            stdscr.addstr(height-1, 2, "Controls: [q] Quit", curses.color_pair(4))
+            stdscr.addstr(height-1, 2, "Controls: [p] Pause/Resume | [q] Quit", curses.color_pair(4))
             stdscr.refresh()
-            
-            # get listings to post first to know total step count
-            with self.db.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT item_code, title, description, price 
-                    FROM listings 
-                    WHERE item_code IN ({})
-                """.format(','.join('?' * len(selected_items))), 
-                    tuple(selected_items)
-                )
-                listings_to_post = cursor.fetchall()
-
-            # define all steps upfront
-            init_step = progress.add_step("Initializing browser")
-            nav_step = progress.add_step("Navigating to Facebook Marketplace")
-            login_step = progress.add_step("Checking login status")
-            fetch_step = progress.add_step("Fetching listings from database")
-
-            # add posting steps immediately
-            posting_steps = []
-            for listing in listings_to_post:
-                step = progress.add_step(f"Posting listing: {listing[0]}")
-                posting_steps.append(step)
-            
-            # initialize browser
-            progress.start_step(init_step)
-            browser = BrowserController()
-            browser.set_progress(progress)  # set progress instance
-            if not browser.initialize_driver():
-                progress.complete_step(init_step, success=False)
-                raise Exception("failed to initialize browser")
-            progress.complete_step(init_step)
-            
-            # navigate to marketplace
-            progress.start_step(nav_step)
-            if not browser.navigate_to_marketplace():
-                progress.complete_step(nav_step, success=False)
-                raise Exception("failed to access marketplace")
-            progress.complete_step(nav_step)
-            
-            # check login status and wait if needed
-            progress.start_step(login_step)
-            progress.set_waiting(login_step)
-
-            # check initial login status
-            if not browser.check_login_status():
-                while browser.driver.find_elements("id", "login_popup_cta_form"):
-                    key = stdscr.getch()
-                    if key == ord('q'):
-                        raise KeyboardInterrupt
-                    time.sleep(0.5)
-                
-            progress.complete_step(login_step)
-            
-            # process each listing
-            for i, (step, listing) in enumerate(zip(posting_steps, listings_to_post)):
-                try:
-                    # navigate back to marketplace for all posts except the first one
-                    if i > 0:
-                        progress.add_debug("navigating back to marketplace...")
-                        if not browser.navigate_to_marketplace():
-                            raise Exception("failed to navigate back to marketplace")
-                        progress.add_debug("navigation successful")
-                    
-                    # start the posting step
-                    progress.start_step(step)
-                    progress.add_debug(f"starting to post listing {listing[0]}...")
-                    
-                    if not browser.post_listing(
-                        title=listing[1],
-                        description=listing[2],
-                        price=listing[3],
-                        item_code=listing[0],
-                        progress=progress
-                    ):
-                        raise Exception("failed to post listing")
-                    
-                    progress.complete_step(step)
-                    success_count += 1
-                    
-                except Exception as e:
-                    progress.complete_step(step, success=False)
-                    failed_count += 1
+            stdscr.nodelay(1)  # poll the controls while posting
+            
+            # the run id prefixes its workers' queue ids, so a resumed run owns its old claims
+            journal = PostingJournal(self.db)
+            if run_id is None:
+                run_id = journal.start_run(selection.describe())
+            pool = PostingPool(self.db, run_id, progress)
+            
+            # jobs the run held when it stopped go back to the queue without waiting for their lease
+            pool.queue.release_claimed(workers=True)
+            
+            # queue the selection, jobs left over from an interrupted run are drained too
+            if selection is not None:
+                pool.queue.enqueue_query(*selection.query("l.item_code"))
+            journal.set_run_status(run_id, 'running')
+            total_count = pool.queue.remaining()
+            
+            # posting steps are added as each job is claimed, after each worker's three setup steps
+            progress.plan_steps(total_count + 3 * pool.workers)
+            
+            # the browsers post from their own threads, this one only handles the controls
+            pool.start()
+            last_heartbeat = time.time()
+            while pool.is_alive():
+                # keep the run from looking crashed to other processes, paused or not
+                if time.time() - last_heartbeat >= Config.RUN_HEARTBEAT_SECONDS:
+                    journal.heartbeat(run_id)
+                    last_heartbeat = time.time()
+                action = self.handle_posting_controls(stdscr, progress)
+                if action == "paused":
+                    pool.controls.pause()
+                    journal.set_run_status(run_id, 'paused')
+                elif action == "running":
+                    pool.controls.resume()
+                    journal.set_run_status(run_id, 'running')
+                elif action == "quit":
+                    raise KeyboardInterrupt
+                time.sleep(0.1)
+            pool.join()
+            
+            # a run where no browser got going failed, rather than finished
+            if len(pool.errors) == pool.workers:
+                raise Exception(pool.errors[0])
+            run_status = 'finished'
             
         except KeyboardInterrupt:
-            if 'progress' in locals():
-                current_step = progress.step_manager.current_step
-                if current_step:
-                    progress.complete_step(current_step, success=False)
+            # workers stop at their next checkpoint and hand their jobs straight back to the queue
+            if 'pool' in locals():
+                progress.set_paused(False)
+                progress.add_debug("stopping, waiting for workers to reach a safe point...")
+                pool.stop()
+                pool.join()
         except Exception as e:
+            if 'pool' in locals():
+                pool.stop()
+                pool.join()
             if 'progress' in locals():
                 current_step = progress.step_manager.current_step
                 if current_step:
                     progress.complete_step(current_step, success=False)
             raise
         finally:
+            if 'journal' in locals():
+                journal.set_run_status(run_id, run_status)
             if 'progress' in locals():
                 progress.running = False
-            if 'browser' in locals():
-                browser.close()
+            if 'pool' in locals():
+                success_count = pool.counts['posted']
+                failed_count = pool.counts['failed']
             
             # show summary
             elapsed_time = time.time() - start_time
-            total_count = len(selected_items)
             
             stdscr.clear()
             height, width = stdscr.getmaxyx()
@@ -524,14 +607,65 @@ class MenuUI:
             stdscr.refresh()
             
             # process the file
-            self.bot.process_excel_file(file_path)
+            diff = self.bot.process_excel_file(file_path)
             
             # show success message
-            self.show_message(stdscr, "File processed successfully!")
+            images = diff['images']
+            self.show_message(
+                stdscr,
+                f"File processed: {diff['inserted']} new, {diff['updated']} updated, {diff['unchanged']} unchanged | "
+                f"images: {images['normalized']} normalized, {images['skipped']} up to date, {images['failed']} failed"
+            )
             
         except Exception as e:
             self.show_message(stdscr, f"Error: {str(e)}", error=True)
 
+    def process_excel_files(self, stdscr, file_paths: List[str]):
+        """batch import all excel files and show per-file timings"""
+        try:
+            stdscr.clear()
+            height, width = stdscr.getmaxyx()
+            
+            msg = f"Importing {len(file_paths)} files..."
+            stdscr.addstr(height//2 - 1, (width - len(msg))//2, msg, curses.color_pair(3))
+            stdscr.addstr(height//2 + 1, (width - 20)//2, "Please wait...", curses.color_pair(4))
+            stdscr.refresh()
+            
+            summary = self.bot.process_excel_files(file_paths)
+        except Exception as e:
+            self.show_message(stdscr, f"Error: {str(e)}", error=True)
+            return
+        
+        stdscr.clear()
+        height, width = stdscr.getmaxyx()
+        
+        # header
+        stdscr.addstr(0, 0, "Batch Import Summary", curses.A_BOLD | curses.color_pair(3))
+        stdscr.hline(1, 0, '-', width)
+        
+        lines = [(f"{f['source']}: {f['rows']} rows in {f['seconds']:.1f}s", curses.color_pair(3)) for f in summary['files']]
+        lines.append(("", 0))
+        lines.append((f"New: {summary['inserted']} | Updated: {summary['updated']} | "
+                      f"Unchanged: {summary['unchanged']} | Total time: {summary['seconds']:.1f}s", curses.color_pair(1)))
+        images = summary['images']
+        lines.append((f"Images: {images['normalized']} normalized, {images['skipped']} up to date, "
+                      f"{images['failed']} failed, {images['bytes_saved'] / 1024 / 1024:.1f} MB saved", curses.color_pair(1)))
+        for error in images['errors']:
+            lines.append((f"Image error {error}", curses.color_pair(2)))
+        for item_code, sources in summary['conflicts'].items():
+            lines.append((f"Conflict {item_code}: {', '.join(sources)}", curses.color_pair(4)))
+        for error in summary['errors']:
+            lines.append((f"Error {error}", curses.color_pair(2)))
+        
+        for idx, (line, color) in enumerate(lines[:height - 5]):
+            stdscr.addstr(idx + 2, 2, line[:width - 3], color)
+        
+        # footer
+        stdscr.hline(height-2, 0, '-', width)
+        stdscr.addstr(height-1, 2, "Press any key to continue...", curses.color_pair(4))
+        stdscr.refresh()
+        stdscr.getch()
+    
     def handle_posting_controls(self, stdscr, progress):
         """handle posting control keys"""
         key = stdscr.getch()
@@ -539,12 +673,8 @@ class MenuUI:
             return None
         
         if key == ord('p'):  # pause/play
-            if progress.status == "running":
-                progress.update(progress.description, status="paused")
-                return "paused"
-            elif progress.status == "paused":
-                progress.update(progress.description, status="running")
-                return "running"
+            progress.set_paused(not progress.paused)
+            return "paused" if progress.paused else "running"
         elif key == ord('q'):  # quit
             return "quit"
         return None
\ No newline at end of file
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import time
+import unicodedata
+from typing import Dict, Optional
+from .db_handler import DatabaseHandler
+from ..config import Config
+
+# cache hits remembered before their last_used is written, when no put flushes them first
+TOUCH_FLUSH_SIZE = 256
+
+def normalize_text(value) -> str:
+    """fold case, unicode forms, whitespace and trailing punctuation so near-identical text matches"""
+    text = unicodedata.normalize('NFKC', str(value or '')).casefold()
+    return ' '.join(text.split()).rstrip(' .,;:!')
+
+def normalize_price(value) -> str:
+    """prices compare to the cent, whatever type the sheet gave them"""
+    try:
+        return f"{float(value):.2f}"
+    except (TypeError, ValueError):
+        return normalize_text(value)
+
+def content_key(fields: Dict, version: str, model: str) -> str:
+    """hash the normalized prompt fields together with the prompt version and model"""
+    normalized = {
+        name: normalize_price(value) if name == 'price' else normalize_text(value)
+        for name, value in sorted(fields.items())
+    }
+    return hashlib.sha256(json.dumps([version, model, normalized]).encode('utf-8')).hexdigest()
+
+class ContentCache:
+    """generated titles and descriptions by content key, least recently used evicted first
+    
+    lives in the listings database, so every process importing into it shares the cache.
+    a hit is a plain read: its last_used is batched up and written with the next put,
+    after TOUCH_FLUSH_SIZE hits or on flush(), keeping writes off the lookup path
+    """
+    
+    def __init__(self, db: Optional[DatabaseHandler] = None, max_entries: int = Config.CONTENT_CACHE_MAX_ENTRIES):
+        self.db = db or DatabaseHandler()
+        self.max_entries = max_entries
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0, 'evicted': 0}
+        # key -> [last hit time, hits] not yet written
+        self._touched: Dict[str, list] = {}
+        self._initialize_table()
+        self._size = self.count()
+    
+    def _initialize_table(self):
+        """create the cache table if it doesn't exist"""
+        conn = self.db.get_connection()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS content_cache (
+                    key TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    description TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_content_cache_last_used ON content_cache (last_used)")
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """return cached content for a key and mark it recently used, None on a miss"""
+        row = self.db.get_connection().execute(
+            "SELECT title, description FROM content_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        touched = self._touched.setdefault(key, [0.0, 0])
+        touched[0] = time.time()
+        touched[1] += 1
+        if len(self._touched) >= TOUCH_FLUSH_SIZE:
+            self.flush()
+        return {'title': row[0], 'description': row[1]}
+    
+    def flush(self):
+        """write the last_used and hit counts of pending hits in one transaction"""
+        if not self._touched:
+            return
+        touched, self._touched = self._touched, {}
+        conn = self.db.get_connection()
+        with conn:
+            conn.executemany(
+                "UPDATE content_cache SET last_used = MAX(last_used, ?), hits = hits + ? WHERE key = ?",
+                [(last_used, hits, key) for key, (last_used, hits) in touched.items()]
+            )
+    
+    def put(self, key: str, content: Dict, model: str):
+        """store generated content, evicting the least recently used entries beyond max_entries"""
+        # pending hits go out first, so eviction sees them
+        self.flush()
+        now = time.time()
+        conn = self.db.get_connection()
+        with conn:
+            inserted = conn.execute("""
+                INSERT OR IGNORE INTO content_cache (key, title, description, model, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (key, content['title'], content['description'], model, now, now)).rowcount
+            if not inserted:
+                conn.execute(
+                    "UPDATE content_cache SET title = ?, description = ?, last_used = ? WHERE key = ?",
+                    (content['title'], content['description'], now, key)
+                )
+        self.stats['stored'] += 1
+        if inserted:
+            self._size += 1
+        if self._size > self.max_entries:
+            self.evict()
+    
+    def evict(self):
+        """trim the cache to max_entries, with some headroom so eviction doesn't run on every put"""
+        self.flush()
+        conn = self.db.get_connection()
+        with conn:
+            # other processes may have grown the table too, so trim to the real size
+            size = conn.execute("SELECT COUNT(*) FROM content_cache").fetchone()[0]
+            keep = self.max_entries - self.max_entries // 10
+            evicted = 0
+            if size > self.max_entries:
+                evicted = conn.execute("""
+                    DELETE FROM content_cache WHERE key IN (
+                        SELECT key FROM content_cache ORDER BY last_used LIMIT ?
+                    )
+                """, (size - keep,)).rowcount
+        self._size = size - evicted
+        self.stats['evicted'] += evicted
+    
+    def count(self) -> int:
+        """number of cached entries"""
+        return self.db.get_connection().execute("SELECT COUNT(*) FROM content_cache").fetchone()[0]
+    
+    def clear(self):
+        """drop every cached entry, e.g. after changing the prompt by hand"""
+        self._touched = {}
+        conn = self.db.get_connection()
+        with conn:
+            conn.execute("DELETE FROM content_cache")
+        self._size = 0
+    
+    def get_stats(self) -> Dict:
+        """hit/miss counters of this instance plus the current size"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'entries': self.count(),
+            'hit_rate': self.stats['hits'] / lookups if lookups else None
+        }
\ No newline at end of file
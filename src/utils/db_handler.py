@@ -1,50 +1,391 @@
 import sqlite3
 import os
-from typing import List
+import threading
+import re
+from typing import List, Dict, Optional, Iterable, Tuple
+from ..config import Config
+
+# listings columns; id is declared so the search index keys on it, an implicit rowid may be renumbered by VACUUM
+LISTINGS_COLUMNS = """
+    id INTEGER PRIMARY KEY,
+    item_code TEXT UNIQUE,
+    title TEXT,
+    description TEXT,
+    price REAL,
+    status TEXT DEFAULT 'pending',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    fingerprint TEXT
+"""
 
 class DatabaseHandler:
-    def __init__(self):
+    # one long-lived connection per thread and database file, shared by all handlers
+    _local = threading.local()
+    _connections: List[sqlite3.Connection] = []
+    _connections_lock = threading.Lock()
+    
+    def __init__(self, db_path: Optional[str] = None):
         # create data directory if it doesn't exist
         data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data')
         os.makedirs(data_dir, exist_ok=True)
         
         # set database path
-        self.db_path = os.path.join(data_dir, 'listings.db')
+        self.db_path = db_path or os.path.join(data_dir, 'listings.db')
         self._initialize_db()
     
     def _initialize_db(self):
         """create database and tables if they don't exist"""
-        with sqlite3.connect(self.db_path) as conn:
+        self._migrate_listing_ids()
+        with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS listings (
-                    item_code TEXT PRIMARY KEY,
-                    title TEXT,
-                    description TEXT,
-                    price REAL,
-                    status TEXT DEFAULT 'pending',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            cursor.execute(f"CREATE TABLE IF NOT EXISTS listings ({LISTINGS_COLUMNS})")
+            
+            # add columns introduced after the table was first created
+            cursor.execute("PRAGMA table_info(listings)")
+            columns = [row[1] for row in cursor.fetchall()]
+            if 'fingerprint' not in columns:
+                cursor.execute("ALTER TABLE listings ADD COLUMN fingerprint TEXT")
+            
+            # index backing the newest-first keyset pagination, with or without a status filter
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_listings_status_created ON listings (status, created_at, item_code)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_listings_created ON listings (created_at, item_code)")
+            conn.commit()
+        
+        self._initialize_counts()
+        self._initialize_version()
+        self._initialize_search()
+    
+    def _migrate_listing_ids(self):
+        """rebuild a listings table from before it had a declared id, keeping each row's rowid as its id
+        
+        dropping the old table drops its triggers too, the derived tables are dropped with
+        them and everything is recreated by the _initialize_* steps that follow
+        """
+        conn = self.get_connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(listings)")]
+            if not columns or 'id' in columns:
+                return
+            
+            conn.execute("DROP TABLE IF EXISTS listings_fts")
+            conn.execute("DROP TABLE IF EXISTS listing_counts")
+            conn.execute(f"CREATE TABLE listings_migrated ({LISTINGS_COLUMNS})")
+            copied = ', '.join(columns)
+            conn.execute(f"INSERT INTO listings_migrated (id, {copied}) SELECT rowid, {copied} FROM listings")
+            conn.execute("DROP TABLE listings")
+            conn.execute("ALTER TABLE listings_migrated RENAME TO listings")
+    
+    def _initialize_counts(self):
+        """create the per-status row count cache, kept current by triggers"""
+        conn = self.get_connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'listing_counts'"
+            ).fetchone()
+            if exists:
+                return
+            
+            conn.execute("CREATE TABLE listing_counts (status TEXT PRIMARY KEY, count INTEGER NOT NULL)")
+            conn.execute("INSERT INTO listing_counts (status, count) SELECT status, COUNT(*) FROM listings GROUP BY status")
+            conn.execute("""
+                CREATE TRIGGER listing_counts_insert AFTER INSERT ON listings BEGIN
+                    INSERT INTO listing_counts (status, count) VALUES (NEW.status, 1)
+                    ON CONFLICT(status) DO UPDATE SET count = count + 1;
+                END
+            """)
+            conn.execute("""
+                CREATE TRIGGER listing_counts_delete AFTER DELETE ON listings BEGIN
+                    UPDATE listing_counts SET count = count - 1 WHERE status = OLD.status;
+                END
+            """)
+            conn.execute("""
+                CREATE TRIGGER listing_counts_update AFTER UPDATE OF status ON listings
+                WHEN OLD.status IS NOT NEW.status BEGIN
+                    UPDATE listing_counts SET count = count - 1 WHERE status = OLD.status;
+                    INSERT INTO listing_counts (status, count) VALUES (NEW.status, 1)
+                    ON CONFLICT(status) DO UPDATE SET count = count + 1;
+                END
+            """)
+    
+    def _initialize_version(self):
+        """create the listings change counter, bumped by triggers on every write"""
+        conn = self.get_connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            # checked by trigger, the version itself outlives a rebuild of listings
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'listing_version_insert'"
+            ).fetchone()
+            if exists:
+                return
+            
+            conn.execute("CREATE TABLE IF NOT EXISTS listing_version (id INTEGER PRIMARY KEY CHECK (id = 1), version INTEGER NOT NULL)")
+            conn.execute("INSERT OR IGNORE INTO listing_version (id, version) VALUES (1, 0)")
+            for event in ('INSERT', 'UPDATE', 'DELETE'):
+                conn.execute(f"""
+                    CREATE TRIGGER listing_version_{event.lower()} AFTER {event} ON listings BEGIN
+                        UPDATE listing_version SET version = version + 1 WHERE id = 1;
+                    END
+                """)
+    
+    def _initialize_search(self):
+        """create the full-text index over titles and descriptions, kept in sync by triggers"""
+        conn = self.get_connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'listings_fts'"
+            ).fetchone()
+            if exists:
+                return
+            
+            # external content table: the index stores tokens only, text is read from listings
+            conn.execute("""
+                CREATE VIRTUAL TABLE listings_fts USING fts5(
+                    title, description, content='listings', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
                 )
             """)
-            conn.commit()
+            conn.execute("INSERT INTO listings_fts (listings_fts) VALUES ('rebuild')")
+            conn.execute("""
+                CREATE TRIGGER listings_fts_insert AFTER INSERT ON listings BEGIN
+                    INSERT INTO listings_fts (rowid, title, description) VALUES (NEW.id, NEW.title, NEW.description);
+                END
+            """)
+            conn.execute("""
+                CREATE TRIGGER listings_fts_delete AFTER DELETE ON listings BEGIN
+                    INSERT INTO listings_fts (listings_fts, rowid, title, description)
+                    VALUES ('delete', OLD.id, OLD.title, OLD.description);
+                END
+            """)
+            conn.execute("""
+                CREATE TRIGGER listings_fts_update AFTER UPDATE OF title, description ON listings BEGIN
+                    INSERT INTO listings_fts (listings_fts, rowid, title, description)
+                    VALUES ('delete', OLD.id, OLD.title, OLD.description);
+                    INSERT INTO listings_fts (rowid, title, description) VALUES (NEW.id, NEW.title, NEW.description);
+                END
+            """)
     
     def get_existing_listings(self) -> List[str]:
         """get list of existing item codes"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT item_code FROM listings")
             return [row[0] for row in cursor.fetchall()]
     
-    def add_listing(self, item_code: str, title: str, description: str, price: float):
+    def get_listing_count(self, status: Optional[str] = None) -> int:
+        """get the cached number of listings, optionally for one status"""
+        conn = self.get_connection()
+        if status is None:
+            row = conn.execute("SELECT COALESCE(SUM(count), 0) FROM listing_counts").fetchone()
+        else:
+            row = conn.execute("SELECT COALESCE(SUM(count), 0) FROM listing_counts WHERE status = ?", (status,)).fetchone()
+        return row[0]
+    
+    def get_status_counts(self) -> Dict[str, int]:
+        """get the cached number of listings per status"""
+        return dict(self.get_connection().execute("SELECT status, count FROM listing_counts").fetchall())
+    
+    def get_listings_version(self) -> int:
+        """get a counter that changes whenever the listings table does"""
+        return self.get_connection().execute("SELECT version FROM listing_version WHERE id = 1").fetchone()[0]
+    
+    def get_listings_page(self, status: Optional[str] = None, after: Optional[Tuple[str, str]] = None,
+                          limit: int = 15) -> List[sqlite3.Row]:
+        """get a newest-first page of listings starting after the (created_at, item_code) key"""
+        conditions = []
+        params = []
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        if after is not None:
+            # seek past the previous page instead of counting rows with OFFSET
+            conditions.append("(created_at, item_code) < (?, ?)")
+            params.extend(after)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        cursor = self.get_connection().cursor()
+        cursor.row_factory = sqlite3.Row
+        cursor.execute(f"""
+            SELECT item_code, title, description, price, status, created_at
+            FROM listings
+            {where}
+            ORDER BY created_at DESC, item_code DESC
+            LIMIT ?
+        """, (*params, limit))
+        return cursor.fetchall()
+    
+    def search_listings(self, text: str, status: Optional[str] = None, limit: int = 50) -> List[sqlite3.Row]:
+        """full-text search over titles and descriptions, best bm25 match first
+        
+        every word must match and the last one is matched as a prefix, so results
+        narrow as the text is typed
+        """
+        search = self._search_conditions(text, status)
+        if search is None:
+            return []
+        where, params = search
+        
+        cursor = self.get_connection().cursor()
+        cursor.row_factory = sqlite3.Row
+        # titles weigh twice as much as descriptions
+        cursor.execute(f"""
+            SELECT l.item_code, l.title, l.description, l.price, l.status, l.created_at
+            FROM listings_fts
+            JOIN listings l ON l.id = listings_fts.rowid
+            WHERE {where}
+            ORDER BY bm25(listings_fts, 2.0, 1.0)
+            LIMIT ?
+        """, (*params, limit))
+        return cursor.fetchall()
+    
+    def count_search_matches(self, text: str, status: Optional[str] = None) -> int:
+        """number of listings search_listings would find without a limit"""
+        search = self._search_conditions(text, status)
+        if search is None:
+            return 0
+        where, params = search
+        return self.get_connection().execute(f"""
+            SELECT COUNT(*)
+            FROM listings_fts
+            JOIN listings l ON l.id = listings_fts.rowid
+            WHERE {where}
+        """, params).fetchone()[0]
+    
+    def _search_conditions(self, text: str, status: Optional[str]) -> Optional[Tuple[str, List]]:
+        """WHERE clause and params for a search, None if the text has no words"""
+        words = re.findall(r'\w+', text.lower())
+        if not words:
+            return None
+        # quote each word so user input is never parsed as fts5 query syntax
+        match = ' '.join(f'"{word}"' for word in words) + '*'
+        
+        conditions = ["listings_fts MATCH ?"]
+        params = [match]
+        if status is not None:
+            conditions.append("l.status = ?")
+            params.append(status)
+        return ' AND '.join(conditions), params
+    
+    def find_changed_listings(self, rows: Iterable[Tuple[str, str]]) -> Dict[str, str]:
+        """stage (item_code, fingerprint) rows and return {item_code: 'insert' | 'update'} for rows needing work"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("CREATE TEMP TABLE IF NOT EXISTS staged_items (item_code TEXT PRIMARY KEY, fingerprint TEXT)")
+            cursor.execute("DELETE FROM staged_items")
+            cursor.executemany("INSERT OR REPLACE INTO staged_items (item_code, fingerprint) VALUES (?, ?)", rows)
+            
+            # anti-join against listings: unknown codes are inserts, differing fingerprints are updates
+            cursor.execute("""
+                SELECT s.item_code, CASE WHEN l.item_code IS NULL THEN 'insert' ELSE 'update' END
+                FROM staged_items s
+                LEFT JOIN listings l ON l.item_code = s.item_code
+                WHERE l.item_code IS NULL OR l.fingerprint IS NOT s.fingerprint
+            """)
+            changed = dict(cursor.fetchall())
+            cursor.execute("DROP TABLE staged_items")
+            return changed
+    
+    def add_listing(self, item_code: str, title: str, description: str, price: float, fingerprint: Optional[str] = None):
         """add new listing to database"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "INSERT INTO listings (item_code, title, description, price) VALUES (?, ?, ?, ?)",
-                (item_code, title, description, price)
+                "INSERT INTO listings (item_code, title, description, price, fingerprint) VALUES (?, ?, ?, ?, ?)",
+                (item_code, title, description, price, fingerprint)
             )
             conn.commit()
     
-    def get_connection(self):
-        """get database connection"""
-        return sqlite3.connect(self.db_path)
\ No newline at end of file
+    def upsert_listings(self, records: Iterable[Dict], chunk_size: Optional[int] = 500) -> Dict[str, int]:
+        """insert or update listing records in chunked transactions, return inserted/updated counts
+        
+        chunk_size=None writes everything in a single transaction
+        """
+        counts = {'inserted': 0, 'updated': 0}
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if chunk_size and len(chunk) >= chunk_size:
+                self._upsert_chunk(chunk, counts)
+                chunk = []
+        if chunk:
+            self._upsert_chunk(chunk, counts)
+        return counts
+    
+    def _upsert_chunk(self, records: List[Dict], counts: Dict[str, int]):
+        """upsert one chunk inside a single write transaction"""
+        conn = self.get_connection()
+        with conn:
+            # take the write lock up front so the row count can't move under us, the
+            # trigger-kept listing_counts gives it without scanning listings
+            conn.execute("BEGIN IMMEDIATE")
+            before = conn.execute("SELECT COALESCE(SUM(count), 0) FROM listing_counts").fetchone()[0]
+            
+            # unchanged rows are skipped by the WHERE, so only real updates are counted
+            # (rowcount, unlike total_changes, leaves out rows touched by triggers)
+            cursor = conn.executemany("""
+                INSERT INTO listings (item_code, title, description, price, fingerprint)
+                VALUES (:item_code, :title, :description, :price, :fingerprint)
+                ON CONFLICT(item_code) DO UPDATE SET
+                    title = excluded.title,
+                    description = excluded.description,
+                    price = excluded.price,
+                    fingerprint = excluded.fingerprint
+                WHERE listings.fingerprint IS NOT excluded.fingerprint
+                    OR listings.title IS NOT excluded.title
+                    OR listings.description IS NOT excluded.description
+                    OR listings.price IS NOT excluded.price
+            """, records)
+            
+            inserted = conn.execute("SELECT COALESCE(SUM(count), 0) FROM listing_counts").fetchone()[0] - before
+            counts['inserted'] += inserted
+            counts['updated'] += cursor.rowcount - inserted
+    
+    def get_connection(self) -> sqlite3.Connection:
+        """get this thread's persistent database connection"""
+        connections = getattr(self._local, 'connections', None)
+        if connections is None:
+            connections = self._local.connections = {}
+        
+        conn = connections.get(self.db_path)
+        if conn is None:
+            conn = self._connect()
+            connections[self.db_path] = conn
+        return conn
+    
+    def _connect(self) -> sqlite3.Connection:
+        """open a connection tuned for a ui reading while a posting thread writes"""
+        conn = sqlite3.connect(self.db_path, timeout=Config.DB_BUSY_TIMEOUT, cached_statements=Config.DB_CACHED_STATEMENTS)
+        
+        # wal lets readers run alongside a writer instead of blocking on it
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{Config.DB_CACHE_SIZE_KB}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+    
+    def close_connection(self):
+        """close this thread's connection, e.g. before a worker thread exits"""
+        connections = getattr(self._local, 'connections', None)
+        conn = connections.pop(self.db_path, None) if connections else None
+        if conn is not None:
+            with self._connections_lock:
+                if conn in self._connections:
+                    self._connections.remove(conn)
+            conn.close()
+    
+    @classmethod
+    def close_all(cls):
+        """close every pooled connection, e.g. on shutdown"""
+        with cls._connections_lock:
+            for conn in cls._connections:
+                try:
+                    conn.close()
+                except sqlite3.ProgrammingError:
+                    # connections can only be closed from their own thread
+                    pass
+            cls._connections.clear()
+        cls._local = threading.local()
\ No newline at end of file
@@ -0,0 +1,103 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from zipfile import ZipFile
+import xml.etree.ElementTree as ET
+import posixpath
+
+# xml namespaces used by the workbook, sheet and drawing parts
+MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+XDR_NS = '{http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing}'
+A_NS = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+R_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+@dataclass
+class ImageAnchor:
+    row: int  # 0-based sheet row of the top-left corner
+    col: int  # 0-based sheet column of the top-left corner
+    media_path: str  # zip member holding the picture, e.g. xl/media/image3.png
+
+class DrawingParser:
+    """read picture anchors straight from the xlsx zip, without openpyxl"""
+    
+    def __init__(self, archive: ZipFile):
+        self.archive = archive
+        self._names = set(archive.namelist())
+    
+    def get_sheet_path(self, sheet_name: Optional[str] = None) -> str:
+        """return the zip path of the named sheet, or of the active sheet"""
+        sheets = self.get_sheet_paths()
+        if sheet_name is not None:
+            if sheet_name not in sheets:
+                raise Exception(f"sheet not found: {sheet_name}")
+            return sheets[sheet_name]
+        
+        # the active sheet is stored as an index into the sheet list
+        root = ET.fromstring(self.archive.read('xl/workbook.xml'))
+        view = root.find(f'{MAIN_NS}bookViews/{MAIN_NS}workbookView')
+        active = int(view.get('activeTab', 0)) if view is not None else 0
+        paths = list(sheets.values())
+        return paths[active] if active < len(paths) else paths[0]
+    
+    def get_sheet_paths(self) -> Dict[str, str]:
+        """return mapping of sheet name to zip path, in workbook order"""
+        root = ET.fromstring(self.archive.read('xl/workbook.xml'))
+        targets = self._get_rel_targets('xl/workbook.xml', 'worksheet')
+        
+        sheets = {}
+        for sheet in root.iter(f'{MAIN_NS}sheet'):
+            target = targets.get(sheet.get(f'{R_NS}id'))
+            if target:
+                sheets[sheet.get('name')] = target
+        return sheets
+    
+    def get_image_anchors(self, sheet_path: str) -> List[ImageAnchor]:
+        """return every picture anchored on the sheet, sorted by position"""
+        anchors = []
+        for drawing_path in self._get_rel_targets(sheet_path, 'drawing').values():
+            media = self._get_rel_targets(drawing_path, 'image')
+            root = ET.fromstring(self.archive.read(drawing_path))
+            
+            # twoCellAnchor / oneCellAnchor both carry a <from> cell; absoluteAnchor has none
+            for anchor in root:
+                start = anchor.find(f'{XDR_NS}from')
+                blip = anchor.find(f'.//{A_NS}blip')
+                if start is None or blip is None:
+                    continue
+                
+                media_path = media.get(blip.get(f'{R_NS}embed'))
+                if media_path and media_path in self._names:
+                    anchors.append(ImageAnchor(
+                        row=int(start.findtext(f'{XDR_NS}row', '0')),
+                        col=int(start.findtext(f'{XDR_NS}col', '0')),
+                        media_path=media_path
+                    ))
+        
+        anchors.sort(key=lambda a: (a.row, a.col))
+        return anchors
+    
+    def get_row_images(self, sheet_path: str) -> Dict[int, str]:
+        """return mapping of 0-based sheet row to its first (left-most) picture"""
+        row_images = {}
+        for anchor in self.get_image_anchors(sheet_path):
+            row_images.setdefault(anchor.row, anchor.media_path)
+        return row_images
+    
+    def _get_rel_targets(self, part_path: str, rel_type: str) -> Dict[str, str]:
+        """resolve a part's relationships of the given type to zip paths, keyed by id"""
+        folder, name = posixpath.split(part_path)
+        rels_path = posixpath.join(folder, '_rels', f'{name}.rels')
+        if rels_path not in self._names:
+            return {}
+        
+        targets = {}
+        for rel in ET.fromstring(self.archive.read(rels_path)).iter(f'{REL_NS}Relationship'):
+            if not rel.get('Type', '').endswith(f'/{rel_type}') or rel.get('TargetMode') == 'External':
+                continue
+            target = rel.get('Target')
+            if target.startswith('/'):
+                target = target.lstrip('/')
+            else:
+                target = posixpath.normpath(posixpath.join(folder, target))
+            targets[rel.get('Id')] = target
+        return targets
\ No newline at end of file
@@ -1,33 +1,23 @@
 import pandas as pd
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional, Tuple
 import openpyxl
 from zipfile import ZipFile
-import re
-import os
 from pathlib import Path
+from .drawing_parser import DrawingParser
+from .image_cache import ImageCache
+from .listing_reader import ListingReader, COLUMNS
 
-class ExcelHandler:
-    def __init__(self, file_path: str):
-        self.file_path = file_path
-        
+class ExcelHandler(ListingReader):
+    extensions = ('.xlsx',)
+    
     def read_listings(self) -> List[Dict]:
         """read excel file and return list of listings"""
         try:
-            # extract and map images first
-            image_map = self._extract_and_map_images()
-            
             # read excel data
             df = pd.read_excel(self.file_path)
             
             # map the unnamed columns to our desired names
-            column_mapping = {
-                'Unnamed: 0': 'description',
-                'Unnamed: 1': 'image',
-                'Unnamed: 2': 'item_code',
-                'Unnamed: 3': 'quantity',
-                'Unnamed: 4': 'price',
-                'Unnamed: 5': 'total'
-            }
+            column_mapping = {f'Unnamed: {idx}': name for idx, name in enumerate(COLUMNS)}
             df = df.rename(columns=column_mapping)
             
             # remove header rows and empty rows
@@ -42,8 +32,11 @@ class ExcelHandler:
             # clean up description (remove newlines)
             df['description'] = df['description'].str.strip()
             
-            # add image paths to the dataframe
-            df['image'] = df.index.map(lambda idx: image_map.get(idx))
+            # add image paths to the dataframe (row 0 of the sheet is the pandas header)
+            image_map = self._extract_and_map_images(
+                {idx + 1: item_code for idx, item_code in df['item_code'].items()}
+            )
+            df['image'] = df.index.map(lambda idx: image_map.get(idx + 1))
             
             # convert dataframe to list of dicts
             listings = df.to_dict('records')
@@ -63,62 +56,97 @@ class ExcelHandler:
         except Exception as e:
             raise Exception(f"error reading excel file: {str(e)}")
     
-    def _extract_and_map_images(self) -> Dict[int, str]:
-        """extract images and return mapping of row index to image path"""
+    def get_sheet_names(self) -> List[str]:
+        """return the names of all sheets in the workbook"""
         try:
-            # setup image directory
-            excel_path = Path(self.file_path)
-            images_dir = excel_path.parent / 'images'
-            images_dir.mkdir(exist_ok=True)
-            
-            # get image positions from openpyxl
-            wb = openpyxl.load_workbook(self.file_path)
-            ws = wb.active
-            
-            item_codes = []
-            for row in ws.iter_rows(min_col=3, max_col=3):  # column C
-                value = row[0].value
-                if value and str(value).strip() != 'ITEM CODE':
-                    item_codes.append(value)
-            
-            # debug print item codes
-            print("\nItem Codes in order:")
-            print(item_codes)
-            
-            # get image positions
-            image_positions = []
-            for idx, image in enumerate(ws._images):
-                if hasattr(image, 'anchor'):
-                    row = image.anchor._from.row
-                    col = image.anchor._from.col
-                    image_positions.append((row, col, idx))
-            
-            # sort by row to maintain spreadsheet order
-            image_positions.sort(key=lambda x: x[0])
-            
-            # debug print positions
-            print("\nImage Positions (row, col, idx):")
-            print(image_positions)
+            with ZipFile(self.file_path) as archive:
+                return list(DrawingParser(archive).get_sheet_paths())
+        except Exception as e:
+            raise Exception(f"error reading excel file: {str(e)}")
+    
+    def iter_listings(self, sheet_name: Optional[str] = None, image_cache: Optional[ImageCache] = None) -> Iterator[Dict]:
+        """stream listings from a sheet (the active one by default) in a single read-only pass"""
+        # a caller-supplied cache is saved by the caller
+        owns_cache = image_cache is None
+        try:
+            if owns_cache:
+                image_cache = ImageCache(Path(self.file_path).parent / 'images')
+            wb = openpyxl.load_workbook(self.file_path, read_only=True, data_only=True)
+        except Exception as e:
+            raise Exception(f"error reading excel file: {str(e)}")
+        
+        try:
+            ws = wb[sheet_name] if sheet_name else wb.active
+            with ZipFile(self.file_path) as archive:
+                # anchors only live in the drawing part, so this stays small
+                row_images = DrawingParser(archive).get_row_images(ws._worksheet_path)
+                
+                for row_idx, values in enumerate(ws.iter_rows(values_only=True)):
+                    listing = self._row_to_listing(values)
+                    if listing is None:
+                        continue
+                    
+                    # extract the image anchored on this row as we reach it
+                    media_path = row_images.get(row_idx)
+                    if media_path:
+                        listing['image'] = image_cache.extract(archive, media_path, listing['item_code'])
+                        listing['image_hash'] = image_cache.get_object_hash(listing['item_code'])
+                    
+                    yield listing
+        finally:
+            wb.close()
+            if owns_cache:
+                image_cache.save()
+    
+    def _row_to_listing(self, values: Tuple) -> Optional[Dict]:
+        """convert a raw sheet row to a listing dict, None for header/empty rows"""
+        values = tuple(values) + (None,) * (len(COLUMNS) - len(values))
+        listing = dict(zip(COLUMNS, values))
+        
+        # skip header rows and empty rows
+        item_code = listing['item_code']
+        if item_code is None or str(item_code).strip() in ('', 'ITEM CODE'):
+            return None
+        
+        # convert numeric columns the same way pd.to_numeric(errors='coerce') does
+        for key in ('quantity', 'price', 'total'):
+            try:
+                listing[key] = float(listing[key])
+            except (TypeError, ValueError):
+                listing[key] = float('nan')
+        
+        # clean up description
+        if isinstance(listing['description'], str):
+            listing['description'] = listing['description'].strip()
+        
+        listing['image'] = None
+        listing['image_hash'] = None
+        return listing
+    
+    def _extract_and_map_images(self, row_item_codes: Dict[int, str]) -> Dict[int, str]:
+        """extract images and return mapping of 0-based sheet row to image path"""
+        try:
+            # setup image cache, unchanged images are skipped on re-import
+            image_cache = ImageCache(Path(self.file_path).parent / 'images')
             
-            # extract images
             with ZipFile(self.file_path) as archive:
-                image_files = sorted(
-                    [f for f in archive.namelist() if re.match(r'xl/media/image\d+\.(png|jpeg|jpg)', f, re.I)],
-                    key=lambda x: int(re.search(r'image(\d+)', x).group(1))
-                )
+                # read anchors straight from the drawing xml, so each image
+                # lands on the row it is actually placed on
+                parser = DrawingParser(archive)
+                row_images = parser.get_row_images(parser.get_sheet_path())
                 
                 # create mapping of row to image path
                 row_to_image = {}
-                for (row, col, _), item_code, image_path in zip(image_positions, item_codes, image_files):
-                    ext = os.path.splitext(image_path)[1]
-                    new_path = images_dir / f"image_{item_code}{ext}"
+                for row, media_path in row_images.items():
+                    item_code = row_item_codes.get(row)
+                    if item_code is None:
+                        continue
                     
                     # extract image
-                    with archive.open(image_path) as source, open(new_path, 'wb') as target:
-                        target.write(source.read())
-                    
-                    row_to_image[row] = str(new_path)
-                    
+                    row_to_image[row] = image_cache.extract(archive, media_path, item_code)
+                
+                image_cache.save()
+                print(f"Images: {image_cache.stats}")
                 return row_to_image
                 
         except Exception as e:
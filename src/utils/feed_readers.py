@@ -0,0 +1,109 @@
+import pandas as pd
+from abc import abstractmethod
+from typing import Dict, Iterator, Optional
+from pathlib import Path
+import os
+from .excel_handler import ExcelHandler
+from .image_cache import ImageCache
+from .listing_reader import ListingReader, COLUMNS
+
+# rows per chunk for the columnar readers
+READ_CHUNK_SIZE = 10000
+
+class FeedReader(ListingReader):
+    """shared chunk handling for machine-generated feeds with named COLUMNS headers"""
+    
+    def iter_listings(self, sheet_name: Optional[str] = None, image_cache: Optional[ImageCache] = None) -> Iterator[Dict]:
+        """stream listings chunk by chunk, copying images referenced by path into the image store"""
+        # a caller-supplied cache is saved by the caller
+        owns_cache = image_cache is None
+        if owns_cache:
+            image_cache = ImageCache(Path(self.file_path).parent / 'images')
+        
+        try:
+            for df in self._iter_chunks():
+                for listing in self._normalize_chunk(df).to_dict('records'):
+                    # missing text is None, like the streaming excel reader
+                    if not isinstance(listing['description'], str):
+                        listing['description'] = None
+                    listing['image_hash'] = None
+                    image_path = self._resolve_image(listing['image'])
+                    if image_path:
+                        listing['image'] = image_cache.import_file(image_path, listing['item_code'])
+                        listing['image_hash'] = image_cache.get_object_hash(listing['item_code'])
+                    else:
+                        listing['image'] = None
+                    yield listing
+        except Exception as e:
+            raise Exception(f"error reading feed file: {str(e)}")
+        finally:
+            if owns_cache:
+                image_cache.save()
+    
+    @abstractmethod
+    def _iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """yield the raw feed in dataframe chunks"""
+    
+    def _normalize_chunk(self, df: pd.DataFrame) -> pd.DataFrame:
+        """apply the same cleanup as the excel reader, column-wise"""
+        if 'item_code' not in df.columns:
+            raise Exception("feed is missing the item_code column")
+        df = df.reindex(columns=COLUMNS)
+        
+        # remove empty rows
+        df = df[df['item_code'].notna()].copy()
+        df['item_code'] = df['item_code'].astype(str).str.strip()
+        df = df[df['item_code'] != '']
+        
+        # convert numeric columns
+        for column in ('quantity', 'price', 'total'):
+            df[column] = pd.to_numeric(df[column], errors='coerce').astype(float)
+        
+        # clean up description
+        df['description'] = df['description'].astype(object).map(lambda value: value.strip() if isinstance(value, str) else value)
+        return df
+    
+    def _resolve_image(self, image) -> Optional[str]:
+        """resolve an image path relative to the feed file, None if it does not exist"""
+        if not isinstance(image, str) or not image.strip():
+            return None
+        image_path = os.path.join(os.path.dirname(os.path.abspath(self.file_path)), image.strip())
+        return image_path if os.path.isfile(image_path) else None
+
+class CsvReader(FeedReader):
+    extensions = ('.csv',)
+    
+    def _iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """read the csv in chunks, keeping item codes as text"""
+        yield from pd.read_csv(
+            self.file_path,
+            chunksize=READ_CHUNK_SIZE,
+            dtype={'item_code': str, 'description': str, 'image': str}
+        )
+
+class ParquetReader(FeedReader):
+    extensions = ('.parquet',)
+    
+    def _iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """read the parquet file one record batch at a time"""
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise Exception("pyarrow is required to read parquet feeds")
+        
+        parquet_file = pq.ParquetFile(self.file_path)
+        columns = [column for column in COLUMNS if column in parquet_file.schema_arrow.names]
+        for batch in parquet_file.iter_batches(batch_size=READ_CHUNK_SIZE, columns=columns):
+            yield batch.to_pandas()
+
+# registered ingest formats, add new readers here
+READERS = [ExcelHandler, CsvReader, ParquetReader]
+SUPPORTED_EXTENSIONS = tuple(ext for reader in READERS for ext in reader.extensions)
+
+def get_reader(file_path: str) -> ListingReader:
+    """return the reader for a file based on its extension"""
+    ext = os.path.splitext(file_path)[1].lower()
+    for reader in READERS:
+        if ext in reader.extensions:
+            return reader(file_path)
+    raise Exception(f"unsupported file type: {ext}")
\ No newline at end of file
@@ -0,0 +1,148 @@
+from pathlib import Path
+from typing import Callable, Dict, Optional
+from zipfile import ZipFile
+import hashlib
+import json
+import os
+import shutil
+
+# copy images in 1mb chunks instead of reading whole members into memory
+CHUNK_SIZE = 1024 * 1024
+
+class ImageCache:
+    """content-addressed store for images extracted from workbooks
+    
+    every distinct image is written once to images/objects/<sha256><ext>;
+    image_<item_code><ext> files are hard links (or copies) of those objects.
+    the manifest remembers which zip member crc/size (or file path/size/mtime)
+    produced which hash, so unchanged images on a re-import are never read again.
+    
+    with defer_links, objects are stored but item links are only recorded in changes,
+    for a parent process to make once it knows which items it keeps.
+    """
+    
+    def __init__(self, images_dir: Path, defer_links: bool = False):
+        self.images_dir = Path(images_dir)
+        self.defer_links = defer_links
+        # manifest entries this instance added or changed, all another process needs to merge
+        self.changes = {'members': {}, 'items': {}}
+        self.objects_dir = self.images_dir / 'objects'
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.images_dir / 'manifest.json'
+        self.manifest = self._load_manifest()
+        self.stats = {'extracted': 0, 'deduplicated': 0, 'unchanged': 0}
+    
+    def _load_manifest(self) -> Dict:
+        """load manifest from disk, starting fresh if it is missing or corrupt"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == 1:
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return {'version': 1, 'members': {}, 'items': {}}
+    
+    def save(self):
+        """write manifest atomically"""
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+    
+    def merge(self, changes: Dict):
+        """fold in the member entries another process added, its item links are made with link_item"""
+        self.manifest['members'].update(changes.get('members', {}))
+    
+    def link_item(self, item_code, object_name: str) -> str:
+        """point image_<item_code> at an object stored by any process, return its path"""
+        return self._link_item(object_name, item_code, os.path.splitext(object_name)[1])
+    
+    def extract(self, archive: ZipFile, media_path: str, item_code) -> str:
+        """extract a zip member as the image for item_code and return its path"""
+        info = archive.getinfo(media_path)
+        ext = os.path.splitext(media_path)[1].lower()
+        member_key = f"{info.CRC:08x}-{info.file_size}{ext}"
+        
+        # reuse the stored object when this exact member was seen before
+        object_name = self.manifest['members'].get(member_key)
+        if object_name is None or not (self.objects_dir / object_name).exists():
+            object_name = self._store_object(lambda: archive.open(media_path), ext)
+            self.manifest['members'][member_key] = object_name
+            self.changes['members'][member_key] = object_name
+        
+        return self._link_item(object_name, item_code, ext)
+    
+    def import_file(self, source_path: str, item_code) -> str:
+        """copy an image file from disk as the image for item_code and return its path"""
+        stat = os.stat(source_path)
+        ext = os.path.splitext(source_path)[1].lower()
+        member_key = f"file:{os.path.abspath(source_path)}-{stat.st_size}-{stat.st_mtime_ns}"
+        
+        # unchanged files are not re-read
+        object_name = self.manifest['members'].get(member_key)
+        if object_name is None or not (self.objects_dir / object_name).exists():
+            object_name = self._store_object(lambda: open(source_path, 'rb'), ext)
+            self.manifest['members'][member_key] = object_name
+            self.changes['members'][member_key] = object_name
+        
+        return self._link_item(object_name, item_code, ext)
+    
+    def _link_item(self, object_name: str, item_code, ext: str) -> str:
+        """point image_<item_code> at a stored object"""
+        target = self.images_dir / f"image_{item_code}{ext}"
+        if self.defer_links:
+            # the path is where the link will be once the parent makes it
+            self.manifest['items'][str(item_code)] = object_name
+            self.changes['items'][str(item_code)] = object_name
+            return str(target)
+        if self.manifest['items'].get(str(item_code)) == object_name and target.exists():
+            self.stats['unchanged'] += 1
+            return str(target)
+        
+        # drop the item's previous image, it may have had another extension
+        previous = self.manifest['items'].get(str(item_code))
+        if previous:
+            stale = self.images_dir / f"image_{item_code}{os.path.splitext(previous)[1]}"
+            if stale.exists():
+                stale.unlink()
+        if target.exists():
+            target.unlink()
+        
+        # identical images shared by several item codes point at one object
+        try:
+            os.link(self.objects_dir / object_name, target)
+        except OSError:
+            shutil.copyfile(self.objects_dir / object_name, target)
+        
+        self.manifest['items'][str(item_code)] = object_name
+        self.changes['items'][str(item_code)] = object_name
+        return str(target)
+    
+    def get_object_hash(self, item_code) -> Optional[str]:
+        """return the content hash of the image currently stored for item_code"""
+        object_name = self.manifest['items'].get(str(item_code))
+        return os.path.splitext(object_name)[0] if object_name else None
+    
+    def _store_object(self, open_source: Callable, ext: str) -> str:
+        """stream a source (zip member or file) into the object store, return its object name"""
+        digest = hashlib.sha256()
+        # per-process temp name, several import workers may share the store
+        tmp_path = self.objects_dir / f"incoming-{os.getpid()}{ext}.tmp"
+        with open_source() as source, open(tmp_path, 'wb') as target:
+            while True:
+                chunk = source.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                target.write(chunk)
+        
+        object_name = f"{digest.hexdigest()}{ext}"
+        object_path = self.objects_dir / object_name
+        if object_path.exists():
+            tmp_path.unlink()
+            self.stats['deduplicated'] += 1
+        else:
+            os.replace(tmp_path, object_path)
+            self.stats['extracted'] += 1
+        return object_name
\ No newline at end of file
@@ -0,0 +1,155 @@
+from concurrent.futures import ProcessPoolExecutor, Future
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from PIL import Image, ImageOps
+from ..config import Config
+import hashlib
+import os
+import shutil
+import time
+
+def normalize_image(source: str, target: str, max_size: int, quality: int) -> Dict:
+    """decode, strip metadata, resize and re-encode one image as jpeg (runs in a worker process)"""
+    start_time = time.time()
+    
+    with Image.open(source) as img:
+        # a jpeg that needs no resizing and carries no metadata is only worth re-encoding if that shrinks it
+        keep_smaller_source = img.format == 'JPEG' and max(img.size) <= max_size and not img.getexif()
+        
+        # apply exif rotation before the metadata is dropped
+        img = ImageOps.exif_transpose(img)
+        
+        # flatten transparency onto white, jpeg has no alpha channel
+        if img.mode in ('RGBA', 'LA', 'P'):
+            img = img.convert('RGBA')
+            background = Image.new('RGB', img.size, (255, 255, 255))
+            background.paste(img, mask=img.getchannel('A'))
+            img = background
+        elif img.mode != 'RGB':
+            img = img.convert('RGB')
+        
+        img.thumbnail((max_size, max_size), Image.LANCZOS)
+        
+        # write to a temp file first so a half-written jpeg is never picked up
+        tmp_path = f"{target}.tmp"
+        img.save(tmp_path, 'JPEG', quality=quality, optimize=True, progressive=True)
+        if keep_smaller_source and os.path.getsize(tmp_path) >= os.path.getsize(source):
+            shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, target)
+    
+    return {
+        'source': source,
+        'target': target,
+        'bytes_in': os.path.getsize(source),
+        'bytes_out': os.path.getsize(target),
+        'seconds': time.time() - start_time
+    }
+
+def file_hash(path: str) -> str:
+    """sha256 of a file, the same content hash the image cache names its objects by"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def link_file(source: str, target: str):
+    """make target a hard link (or copy) of source, unless it already is one"""
+    if os.path.exists(target):
+        if os.path.samefile(source, target):
+            return
+        os.unlink(target)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+class ImageProcessor:
+    """normalizes extracted images on a process pool while ingest continues
+    
+    derivatives are keyed by the source's content hash (normalized/<sha256>.jpg), so an
+    image shared by several items is encoded once and an unchanged one never again.
+    normalized/image_<item_code>.jpg links each item to its derivative.
+    """
+    
+    def __init__(self, images_dir: Optional[str] = None, max_workers: Optional[int] = None):
+        self.images_dir = Path(images_dir or os.path.join(Config.DATA_DIR, 'images'))
+        self.output_dir = self.images_dir / 'normalized'
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.executor = ProcessPoolExecutor(max_workers=max_workers or os.cpu_count())
+        self.futures: List[Future] = []
+        # derivatives queued in this run by content hash, and the item links waiting on them
+        self.queued: Dict[str, str] = {}
+        self.pending_links: List[Tuple[str, str]] = []
+        self.skipped = 0
+    
+    @staticmethod
+    def get_normalized_path(item_code: str, images_dir: Optional[str] = None) -> str:
+        """return where the normalized image for an item code is written"""
+        images_dir = images_dir or os.path.join(Config.DATA_DIR, 'images')
+        return os.path.join(images_dir, 'normalized', f"image_{item_code}.jpg")
+    
+    def get_derivative_path(self, image_hash: str) -> str:
+        """return where the normalized image for a content hash is written"""
+        return str(self.output_dir / f"{image_hash}.jpg")
+    
+    def submit(self, source: str, item_code: str, image_hash: Optional[str] = None):
+        """queue an image for normalization, reusing the derivative of identical content
+        
+        image_hash is the source's sha256 as the image cache reported it, hashed here if not given
+        """
+        image_hash = image_hash or file_hash(source)
+        derivative = self.get_derivative_path(image_hash)
+        item_path = self.get_normalized_path(item_code, str(self.images_dir))
+        
+        if image_hash in self.queued:
+            # already being encoded for another item in this run
+            self.skipped += 1
+            self.pending_links.append((derivative, item_path))
+            return
+        if os.path.exists(derivative):
+            self.skipped += 1
+            link_file(derivative, item_path)
+            return
+        
+        self.queued[image_hash] = derivative
+        self.pending_links.append((derivative, item_path))
+        self.futures.append(self.executor.submit(
+            normalize_image, source, derivative, Config.MAX_IMAGE_SIZE, Config.IMAGE_QUALITY
+        ))
+    
+    def close(self) -> Dict:
+        """wait for queued images, shut the pool down and return a summary
+        
+        nothing is printed, imports run under the curses menu which shows the summary itself
+        """
+        results = []
+        errors = []
+        for future in self.futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                errors.append(str(e))
+        self.executor.shutdown()
+        
+        # point items at their derivatives now that they are written, an item whose image
+        # failed loses its old one too, posting must not upload a stale photo
+        for derivative, item_path in self.pending_links:
+            if os.path.exists(derivative):
+                link_file(derivative, item_path)
+            elif os.path.exists(item_path):
+                os.unlink(item_path)
+        self.pending_links = []
+        
+        bytes_in = sum(r['bytes_in'] for r in results)
+        bytes_out = sum(r['bytes_out'] for r in results)
+        summary = {
+            'normalized': len(results),
+            'skipped': self.skipped,
+            'failed': len(errors),
+            'errors': errors,
+            'bytes_saved': bytes_in - bytes_out,
+            'avg_seconds': sum(r['seconds'] for r in results) / len(results) if results else 0.0,
+            'max_seconds': max((r['seconds'] for r in results), default=0.0)
+        }
+        return summary
\ No newline at end of file
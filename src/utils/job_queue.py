@@ -0,0 +1,196 @@
+import os
+import socket
+import time
+import uuid
+from typing import Dict, Iterable, Optional
+from .db_handler import DatabaseHandler
+from ..config import Config
+
+class PostingQueue:
+    """durable posting queue in sqlite: pending -> claimed -> posted / failed
+    
+    workers claim one job at a time under a write lock, so any number of posting
+    processes can drain the same queue without two of them getting the same job.
+    a claim is a lease: if the worker dies, the job is handed out again once the
+    lease runs out, until it has used up its attempts.
+    """
+    
+    def __init__(self, db: Optional[DatabaseHandler] = None, worker_id: Optional[str] = None,
+                 lease_seconds: int = Config.POSTING_LEASE_SECONDS, max_attempts: int = Config.POSTING_MAX_ATTEMPTS):
+        self.db = db or DatabaseHandler()
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._initialize_table()
+    
+    def _initialize_table(self):
+        """create the job table if it doesn't exist"""
+        conn = self.db.get_connection()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS posting_jobs (
+                    id INTEGER PRIMARY KEY,
+                    item_code TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    worker TEXT,
+                    lease_expires REAL,
+                    last_error TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            # an item is queued at most once until its job finishes
+            conn.execute("""
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_posting_jobs_open
+                ON posting_jobs (item_code) WHERE status IN ('pending', 'claimed')
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_posting_jobs_status ON posting_jobs (status, id)")
+    
+    def enqueue_query(self, sql: str, params: Iterable = ()) -> int:
+        """queue the item codes a SELECT returns, without loading them into python"""
+        conn = self.db.get_connection()
+        with conn:
+            cursor = conn.execute(f"INSERT OR IGNORE INTO posting_jobs (item_code) {sql}", tuple(params))
+            return cursor.rowcount
+    
+    def claim(self) -> Optional[Dict]:
+        """atomically take the oldest available job, None when the queue is drained
+        
+        returns the job with the listing fields needed to post it
+        """
+        while True:
+            job, listing = self._claim_next()
+            if job is None:
+                return None
+            if listing is not None:
+                return {
+                    'id': job[0],
+                    'item_code': job[1],
+                    'attempts': job[2],
+                    'title': listing[0],
+                    'description': listing[1],
+                    'price': listing[2]
+                }
+            # the listing was deleted after it was queued, drop the job and take the next one
+            self.fail(job[0], "listing no longer exists", retry=False)
+    
+    def _claim_next(self):
+        """claim the oldest available job, return (job, listing) with listing None if it is gone"""
+        now = time.time()
+        conn = self.db.get_connection()
+        with conn:
+            # the write lock is held from the first statement, so no other worker can
+            # pick the same row between the select and the update
+            conn.execute("BEGIN IMMEDIATE")
+            
+            # expired leases that already used their last attempt are given up on
+            conn.execute("""
+                UPDATE posting_jobs
+                SET status = 'failed', worker = NULL, lease_expires = NULL,
+                    last_error = COALESCE(last_error, 'lease expired'), updated_at = CURRENT_TIMESTAMP
+                WHERE status = 'claimed' AND lease_expires < ? AND attempts >= ?
+            """, (now, self.max_attempts))
+            
+            job = conn.execute("""
+                UPDATE posting_jobs
+                SET status = 'claimed', worker = ?, lease_expires = ?, attempts = attempts + 1,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = (
+                    SELECT id FROM posting_jobs
+                    WHERE status = 'pending' OR (status = 'claimed' AND lease_expires < ?)
+                    ORDER BY id
+                    LIMIT 1
+                )
+                RETURNING id, item_code, attempts
+            """, (self.worker_id, now + self.lease_seconds, now)).fetchall()
+            if not job:
+                return None, None
+            job = job[0]
+            
+            listing = conn.execute(
+                "SELECT title, description, price FROM listings WHERE item_code = ?", (job[1],)
+            ).fetchone()
+        return job, listing
+    
+    def complete(self, job_id: int) -> bool:
+        """mark a job and its listing posted, return False if the lease was lost to another worker"""
+        conn = self.db.get_connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT item_code FROM posting_jobs WHERE id = ? AND worker = ? AND status = 'claimed'",
+                (job_id, self.worker_id)
+            ).fetchone()
+            
+            # the post went through either way, so the listing is posted regardless
+            item_code = row[0] if row else conn.execute(
+                "SELECT item_code FROM posting_jobs WHERE id = ?", (job_id,)
+            ).fetchone()[0]
+            conn.execute("UPDATE listings SET status = 'posted' WHERE item_code = ?", (item_code,))
+            conn.execute("""
+                UPDATE posting_jobs
+                SET status = 'posted', worker = NULL, lease_expires = NULL, last_error = NULL,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, (job_id,))
+            return row is not None
+    
+    def fail(self, job_id: int, error: str, retry: bool = True):
+        """release a job after a failed attempt, back to pending while it has attempts left"""
+        conn = self.db.get_connection()
+        with conn:
+            conn.execute("""
+                UPDATE posting_jobs
+                SET status = CASE WHEN ? AND attempts < ? THEN 'pending' ELSE 'failed' END,
+                    worker = NULL, lease_expires = NULL, last_error = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND (worker = ? OR worker IS NULL)
+            """, (retry, self.max_attempts, error, job_id, self.worker_id))
+    
+    def release(self, job_id: int):
+        """hand a job back untouched, e.g. when the user stops posting"""
+        conn = self.db.get_connection()
+        with conn:
+            conn.execute("""
+                UPDATE posting_jobs
+                SET status = 'pending', worker = NULL, lease_expires = NULL, attempts = MAX(attempts - 1, 0),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND worker = ? AND status = 'claimed'
+            """, (job_id, self.worker_id))
+    
+    def renew(self, job_id: int) -> bool:
+        """extend the lease on a job, False if this worker no longer holds it"""
+        conn = self.db.get_connection()
+        with conn:
+            cursor = conn.execute("""
+                UPDATE posting_jobs
+                SET lease_expires = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND worker = ? AND status = 'claimed'
+            """, (time.time() + self.lease_seconds, job_id, self.worker_id))
+            return cursor.rowcount == 1
+    
+    def release_claimed(self, workers: bool = False) -> int:
+        """hand back every job this worker holds, e.g. when resuming a stopped run under its id
+        
+        with workers, jobs held under '<worker id>-<suffix>' go back too, as a posting
+        pool's workers claim under the run id plus their own suffix
+        """
+        conn = self.db.get_connection()
+        with conn:
+            cursor = conn.execute("""
+                UPDATE posting_jobs
+                SET status = 'pending', worker = NULL, lease_expires = NULL, attempts = MAX(attempts - 1, 0),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE status = 'claimed' AND (worker = ? OR (? AND substr(worker, 1, ?) = ?))
+            """, (self.worker_id, workers, len(self.worker_id) + 1, self.worker_id + '-'))
+            return cursor.rowcount
+    
+    def get_counts(self) -> Dict[str, int]:
+        """number of jobs per status"""
+        cursor = self.db.get_connection().execute("SELECT status, COUNT(*) FROM posting_jobs GROUP BY status")
+        return dict(cursor.fetchall())
+    
+    def remaining(self) -> int:
+        """jobs still waiting or in flight"""
+        counts = self.get_counts()
+        return counts.get('pending', 0) + counts.get('claimed', 0)
\ No newline at end of file
@@ -0,0 +1,146 @@
+import sqlite3
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from .db_handler import DatabaseHandler
+
+# (created_at, item_code) a page starts after, None for the first page
+PageKey = Optional[Tuple[str, str]]
+
+class ListingPager:
+    """newest-first keyset pagination over listings, so every page costs the same
+    
+    the current page and its neighbours are kept in memory and the next page is
+    prefetched on a background thread, so paging only waits on sqlite when the user
+    outruns the prefetch. the window is dropped whenever the listings table changes.
+    """
+    
+    def __init__(self, db: DatabaseHandler, status: Optional[str] = None, page_size: int = 15):
+        self.db = db
+        self.status = status
+        self.page_size = page_size
+        self.page = 0
+        self.rows: List[sqlite3.Row] = []
+        self.total = 0
+        # key each visited page starts after
+        self._page_keys: List[PageKey] = [None]
+        
+        # page window, filled by the ui thread and the prefetch thread
+        self._pages: Dict[PageKey, List[sqlite3.Row]] = {}
+        self._pending: Dict[PageKey, Future] = {}
+        self._lock = threading.Lock()
+        self._version = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='listing-prefetch')
+        self.reload()
+    
+    @property
+    def page_count(self) -> int:
+        return max(1, (self.total + self.page_size - 1) // self.page_size)
+    
+    @property
+    def has_next(self) -> bool:
+        return (self.page + 1) * self.page_size < self.total and len(self.rows) == self.page_size
+    
+    @property
+    def has_prev(self) -> bool:
+        return self.page > 0
+    
+    def reload(self):
+        """drop the page window and re-read the current page and the cached total"""
+        with self._lock:
+            self._pages.clear()
+            # in-flight prefetches may have read the old rows, forget them
+            self._pending.clear()
+        self._version = self.db.get_listings_version()
+        self.total = self.db.get_listing_count(self.status)
+        self._load()
+    
+    def refresh(self) -> bool:
+        """reload if the listings table changed since the window was filled"""
+        if self.db.get_listings_version() == self._version:
+            return False
+        self.reload()
+        return True
+    
+    def next_page(self) -> bool:
+        """move to the next page, seeking past the last row shown"""
+        if not self.has_next:
+            return False
+        self._page_keys.append(self._next_key())
+        self.page += 1
+        self._load()
+        return True
+    
+    def prev_page(self) -> bool:
+        """move back to the previous page"""
+        if not self.has_prev:
+            return False
+        self._page_keys.pop()
+        self.page -= 1
+        self._load()
+        return True
+    
+    def close(self):
+        """stop the prefetch thread and close its connection"""
+        self._executor.submit(self.db.close_connection)
+        self._executor.shutdown(wait=True)
+    
+    def _next_key(self) -> PageKey:
+        last = self.rows[-1]
+        return (last['created_at'], last['item_code'])
+    
+    def _load(self):
+        """show the current page from the window, then trim it and prefetch ahead"""
+        self.rows = self._get_page(self._page_keys[-1])
+        
+        # the page emptied out underneath us, step back
+        if not self.rows and self.page > 0:
+            self.prev_page()
+            return
+        
+        # keep the previous, current and next page only
+        keep = set(self._page_keys[-2:])
+        if self.has_next:
+            keep.add(self._next_key())
+        with self._lock:
+            for key in [key for key in self._pages if key not in keep]:
+                del self._pages[key]
+        
+        if self.has_next:
+            self._prefetch(self._next_key())
+    
+    def _get_page(self, key: PageKey) -> List[sqlite3.Row]:
+        """get a page from the window, waiting on its prefetch or querying it directly"""
+        with self._lock:
+            rows = self._pages.get(key)
+            future = self._pending.get(key) if rows is None else None
+        
+        if future is not None:
+            try:
+                rows = future.result()
+            except Exception:
+                rows = None
+        
+        if rows is None:
+            rows = self.db.get_listings_page(self.status, after=key, limit=self.page_size)
+            with self._lock:
+                self._pages[key] = rows
+        return rows
+    
+    def _prefetch(self, key: PageKey):
+        """read a page on the background thread unless it is already cached or on its way"""
+        with self._lock:
+            if key in self._pages or key in self._pending:
+                return
+            future = self._executor.submit(self.db.get_listings_page, self.status, key, self.page_size)
+            self._pending[key] = future
+        future.add_done_callback(lambda done: self._store(key, done))
+    
+    def _store(self, key: PageKey, future: Future):
+        """move a finished prefetch into the window, unless a reload superseded it"""
+        with self._lock:
+            if self._pending.get(key) is not future:
+                return
+            del self._pending[key]
+            if future.exception() is None:
+                self._pages[key] = future.result()
\ No newline at end of file
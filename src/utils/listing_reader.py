@@ -0,0 +1,30 @@
+from abc import ABC, abstractmethod
+from typing import List, Dict, Iterator, Optional
+import hashlib
+import json
+from .image_cache import ImageCache
+
+# listing schema shared by every ingest format (excel columns A..F)
+COLUMNS = ['description', 'image', 'item_code', 'quantity', 'price', 'total']
+
+def fingerprint_listing(listing: Dict) -> str:
+    """hash the row fields that feed a listing"""
+    fields = [listing.get('description'), listing.get('price'), listing.get('quantity'), listing.get('image_hash')]
+    return hashlib.sha1(json.dumps(fields, default=str).encode('utf-8')).hexdigest()
+
+class ListingReader(ABC):
+    """base class for ingest formats, yields listing dicts in the COLUMNS schema"""
+    
+    # file extensions handled by the reader
+    extensions: tuple = ()
+    
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+    
+    def get_sheet_names(self) -> List[Optional[str]]:
+        """return the sheets to import, [None] for single-table formats"""
+        return [None]
+    
+    @abstractmethod
+    def iter_listings(self, sheet_name: Optional[str] = None, image_cache: Optional[ImageCache] = None) -> Iterator[Dict]:
+        """stream listings with 'image' set to a local path and 'image_hash' to its content hash"""
\ No newline at end of file
@@ -0,0 +1,122 @@
+from typing import List, Optional, Set, Tuple
+from .db_handler import DatabaseHandler
+
+class ListingSelection:
+    """a listing selection kept as rules plus explicit include/exclude rows
+    
+    the rule (every listing with the status, optionally narrowed by price range and
+    creation date) stays in python, toggled item codes go to a temp table, and both
+    are resolved with one join, so selecting all 30k pending listings costs the same
+    memory as selecting one. an explicit include or exclude always beats the rule.
+    """
+    
+    def __init__(self, db: DatabaseHandler, status: Optional[str] = 'pending'):
+        self.db = db
+        self.status = status
+        self.match_rule = False
+        self.min_price: Optional[float] = None
+        self.max_price: Optional[float] = None
+        self.created_after: Optional[str] = None
+        
+        # temp tables are per connection, so the selection lives on this thread's one
+        conn = self.db.get_connection()
+        with conn:
+            conn.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS listing_selection (
+                    item_code TEXT PRIMARY KEY,
+                    included INTEGER NOT NULL
+                )
+            """)
+            conn.execute("DELETE FROM temp.listing_selection")
+    
+    def select_all(self, min_price: Optional[float] = None, max_price: Optional[float] = None,
+                   created_after: Optional[str] = None):
+        """select every listing matching the filters, dropping earlier toggles"""
+        self.match_rule = True
+        self.min_price = min_price
+        self.max_price = max_price
+        self.created_after = created_after
+        self._clear_overrides()
+    
+    def clear(self):
+        """deselect everything"""
+        self.match_rule = False
+        self.min_price = self.max_price = self.created_after = None
+        self._clear_overrides()
+    
+    def toggle(self, item_code: str) -> bool:
+        """flip one listing in or out of the selection, return whether it is now selected"""
+        selected = item_code not in self.selected_codes([item_code])
+        conn = self.db.get_connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO temp.listing_selection (item_code, included) VALUES (?, ?)",
+                (item_code, int(selected))
+            )
+        return selected
+    
+    def selected_codes(self, item_codes: List[str]) -> Set[str]:
+        """return which of a handful of item codes (e.g. one screen page) are selected"""
+        if not item_codes:
+            return set()
+        sql, params = self.query("l.item_code")
+        cursor = self.db.get_connection().execute(
+            f"{sql} AND l.item_code IN ({','.join('?' * len(item_codes))})", (*params, *item_codes)
+        )
+        return {row[0] for row in cursor.fetchall()}
+    
+    def count(self) -> int:
+        """number of selected listings"""
+        sql, params = self.query("COUNT(*)")
+        return self.db.get_connection().execute(sql, params).fetchone()[0]
+    
+    def query(self, columns: str) -> Tuple[str, list]:
+        """return (sql, params) selecting columns of listings l for the selected rows
+        
+        the sql ends in its WHERE clause, so callers can append AND conditions,
+        ORDER BY or use it as the source of an INSERT ... SELECT
+        """
+        rule = ["1"] if self.match_rule else ["0"]
+        params = []
+        if self.match_rule:
+            if self.min_price is not None:
+                rule.append("l.price >= ?")
+                params.append(self.min_price)
+            if self.max_price is not None:
+                rule.append("l.price <= ?")
+                params.append(self.max_price)
+            if self.created_after:
+                # created_after is a bare date, rows from that day are not after it
+                rule.append("date(l.created_at) > ?")
+                params.append(self.created_after)
+        
+        where = f"(s.included = 1 OR (s.item_code IS NULL AND {' AND '.join(rule)}))"
+        if self.status is not None:
+            where = f"l.status = ? AND {where}"
+            params.insert(0, self.status)
+        sql = f"SELECT {columns} FROM listings l LEFT JOIN temp.listing_selection s ON s.item_code = l.item_code WHERE {where}"
+        return sql, params
+    
+    def close(self):
+        """drop the temp table"""
+        conn = self.db.get_connection()
+        with conn:
+            conn.execute("DROP TABLE IF EXISTS temp.listing_selection")
+    
+    def describe(self) -> str:
+        """short human readable summary of the rule"""
+        if not self.match_rule:
+            return "manual"
+        parts = [f"all {self.status}" if self.status else "all"]
+        if self.min_price is not None:
+            parts.append(f"price >= {self.min_price:g}")
+        if self.max_price is not None:
+            parts.append(f"price <= {self.max_price:g}")
+        if self.created_after:
+            parts.append(f"created after {self.created_after}")
+        return ", ".join(parts)
+    
+    def _clear_overrides(self):
+        conn = self.db.get_connection()
+        with conn:
+            conn.execute("DELETE FROM temp.listing_selection")
\ No newline at end of file
@@ -0,0 +1,145 @@
+import time
+from typing import Callable, List, Optional, Tuple
+from selenium.common.exceptions import (
+    JavascriptException, NoSuchElementException, StaleElementReferenceException, TimeoutException
+)
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from ..config import Config
+
+Locator = Tuple[str, str]
+
+# installed once per document: counts in-flight fetch/xhr requests and timestamps the last
+# request and dom mutation, then reports them. re-running it on the same page is a no-op.
+PAGE_ACTIVITY_SCRIPT = """
+if (!window.__pageActivity) {
+    const activity = window.__pageActivity = {inflight: 0, lastRequest: performance.now(), lastMutation: performance.now()};
+    const requested = () => { activity.lastRequest = performance.now(); };
+    if (performance.setResourceTimingBufferSize) {
+        performance.setResourceTimingBufferSize(100000);
+    }
+    if (window.fetch) {
+        const fetch = window.fetch;
+        window.fetch = function() {
+            activity.inflight++;
+            requested();
+            return fetch.apply(this, arguments).finally(() => { activity.inflight--; requested(); });
+        };
+    }
+    const send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        activity.inflight++;
+        requested();
+        this.addEventListener('loadend', () => { activity.inflight--; requested(); });
+        return send.apply(this, arguments);
+    };
+    new MutationObserver(() => { activity.lastMutation = performance.now(); }).observe(
+        document, {subtree: true, childList: true, attributes: true, characterData: true}
+    );
+}
+const activity = window.__pageActivity;
+const now = performance.now();
+return {
+    ready: document.readyState,
+    inflight: activity.inflight,
+    resources: performance.getEntriesByType('resource').length,
+    request_idle_ms: now - activity.lastRequest,
+    mutation_idle_ms: now - activity.lastMutation
+};
+"""
+
+class PageWaits:
+    """explicit readiness conditions for a webdriver page, each with its own timeout
+    
+    element conditions raise TimeoutException like WebDriverWait. the settling
+    conditions (network idle, dom quiet) return False on timeout instead: a page that
+    keeps polling in the background should slow a step down, not fail it.
+    """
+    
+    def __init__(self, driver, poll: float = Config.WAIT_POLL_INTERVAL):
+        self.driver = driver
+        self.poll = poll
+    
+    def until(self, condition: Callable, timeout: float = Config.ELEMENT_TIMEOUT, message: str = ''):
+        """wait for any webdriver condition, returning its first truthy value"""
+        return WebDriverWait(
+            self.driver, timeout, poll_frequency=self.poll,
+            ignored_exceptions=(NoSuchElementException, StaleElementReferenceException)
+        ).until(condition, message)
+    
+    def present(self, locator: Locator, timeout: float = Config.ELEMENT_TIMEOUT) -> WebElement:
+        return self.until(EC.presence_of_element_located(locator), timeout, f"{locator[1]} not present")
+    
+    def clickable(self, locator: Locator, timeout: float = Config.ELEMENT_TIMEOUT) -> WebElement:
+        return self.until(EC.element_to_be_clickable(locator), timeout, f"{locator[1]} not clickable")
+    
+    def any_of(self, conditions: List[Callable], timeout: float = Config.ELEMENT_TIMEOUT) -> Optional[Tuple[int, object]]:
+        """wait until one of several conditions holds, return (index, value) or None on timeout"""
+        def first(driver):
+            for index, condition in enumerate(conditions):
+                try:
+                    value = condition(driver)
+                except (NoSuchElementException, StaleElementReferenceException):
+                    value = False
+                if value:
+                    return index, value
+            return False
+        try:
+            return self.until(first, timeout)
+        except TimeoutException:
+            return None
+    
+    def activity(self) -> dict:
+        """network and dom activity of the current document"""
+        return self.driver.execute_script(PAGE_ACTIVITY_SCRIPT)
+    
+    def document_ready(self, timeout: float = Config.PAGE_LOAD_TIMEOUT) -> bool:
+        """wait for document.readyState to be complete"""
+        try:
+            self.until(lambda driver: driver.execute_script("return document.readyState") == 'complete', timeout)
+            return True
+        except TimeoutException:
+            return False
+    
+    def network_idle(self, idle_ms: int = Config.NETWORK_IDLE_MS, timeout: float = Config.NETWORK_IDLE_TIMEOUT,
+                     max_inflight: int = Config.NETWORK_IDLE_MAX_INFLIGHT) -> bool:
+        """wait until no more than max_inflight requests are open and none started for idle_ms
+        
+        a couple of long-lived requests (long polling, analytics) are allowed, as the
+        page never goes fully quiet. finished resource loads count as activity too, so
+        requests made through references the page took before we hooked in are seen.
+        """
+        deadline = time.monotonic() + timeout
+        resources = None
+        resources_changed = time.monotonic()
+        while True:
+            try:
+                state = self.activity()
+            except JavascriptException:
+                # the document is being replaced, try again on the new one
+                state = None
+            now = time.monotonic()
+            if state is not None:
+                if state['resources'] != resources:
+                    resources = state['resources']
+                    resources_changed = now
+                if (state['inflight'] <= max_inflight and state['request_idle_ms'] >= idle_ms
+                        and (now - resources_changed) * 1000 >= idle_ms):
+                    return True
+            if now >= deadline:
+                return False
+            time.sleep(self.poll)
+    
+    def dom_quiet(self, quiet_ms: int = Config.DOM_QUIET_MS, timeout: float = Config.DOM_QUIET_TIMEOUT) -> bool:
+        """wait until the dom has not changed for quiet_ms, e.g. a menu finished animating in"""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                if self.activity()['mutation_idle_ms'] >= quiet_ms:
+                    return True
+            except JavascriptException:
+                pass
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(self.poll)
\ No newline at end of file
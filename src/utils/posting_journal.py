@@ -0,0 +1,116 @@
+import time
+import uuid
+from typing import Dict, Optional
+from .db_handler import DatabaseHandler
+from ..config import Config
+
+# phases after which the listing may already be live, such jobs are never posted again
+PUBLISH_PHASES = ('publishing', 'published')
+
+class PostingJournal:
+    """write-ahead journal of posting runs and each job's progress through the form
+    
+    every phase is committed before the browser acts on the next one, and
+    'publishing' is committed before the publish click, so after a crash or a
+    quit a run can be resumed without reposting anything that may have gone out.
+    """
+    
+    def __init__(self, db: Optional[DatabaseHandler] = None):
+        self.db = db or DatabaseHandler()
+        self._initialize_tables()
+    
+    def _initialize_tables(self):
+        """create the run and journal tables if they don't exist"""
+        conn = self.db.get_connection()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS posting_runs (
+                    id TEXT PRIMARY KEY,
+                    description TEXT,
+                    status TEXT NOT NULL DEFAULT 'running',
+                    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS posting_journal (
+                    id INTEGER PRIMARY KEY,
+                    run_id TEXT NOT NULL,
+                    job_id INTEGER NOT NULL,
+                    item_code TEXT NOT NULL,
+                    phase TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_posting_journal_job ON posting_journal (job_id, id)")
+    
+    def start_run(self, description: str) -> str:
+        """register a new run and return its id, which prefixes its workers' queue ids"""
+        run_id = f"run-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        conn = self.db.get_connection()
+        with conn:
+            conn.execute("INSERT INTO posting_runs (id, description) VALUES (?, ?)", (run_id, description))
+        return run_id
+    
+    def set_run_status(self, run_id: str, status: str):
+        """record a run as running, paused, interrupted or finished"""
+        conn = self.db.get_connection()
+        with conn:
+            conn.execute(
+                "UPDATE posting_runs SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (status, run_id)
+            )
+    
+    def heartbeat(self, run_id: str):
+        """mark a run as still alive, a live run is never handed to another process to resume"""
+        conn = self.db.get_connection()
+        with conn:
+            conn.execute("UPDATE posting_runs SET updated_at = CURRENT_TIMESTAMP WHERE id = ?", (run_id,))
+    
+    def get_resumable_run(self, stale_seconds: int = Config.RUN_STALE_SECONDS) -> Optional[Dict]:
+        """get the most recent run that was interrupted, or whose process stopped beating, None if there is none"""
+        row = self.db.get_connection().execute("""
+            SELECT id, description, status, started_at
+            FROM posting_runs
+            WHERE status = 'interrupted'
+               OR (status != 'finished' AND updated_at < datetime('now', ?))
+            ORDER BY started_at DESC, rowid DESC
+            LIMIT 1
+        """, (f"-{stale_seconds} seconds",)).fetchone()
+        if row is None:
+            return None
+        return {'id': row[0], 'description': row[1], 'status': row[2], 'started_at': row[3]}
+    
+    def take_over_run(self, run_id: str, stale_seconds: int = Config.RUN_STALE_SECONDS) -> bool:
+        """mark a resumable run running again, False if another process got to it first or it is live"""
+        conn = self.db.get_connection()
+        with conn:
+            cursor = conn.execute("""
+                UPDATE posting_runs SET status = 'running', updated_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND (status = 'interrupted' OR (status != 'finished' AND updated_at < datetime('now', ?)))
+            """, (run_id, f"-{stale_seconds} seconds"))
+            return cursor.rowcount == 1
+    
+    def record(self, run_id: str, job: Dict, phase: str):
+        """append a phase for a job, committed before returning"""
+        conn = self.db.get_connection()
+        with conn:
+            conn.execute(
+                "INSERT INTO posting_journal (run_id, job_id, item_code, phase, created_at) VALUES (?, ?, ?, ?, ?)",
+                (run_id, job['id'], job['item_code'], phase, time.time())
+            )
+    
+    def last_phase(self, job_id: int) -> Optional[str]:
+        """latest phase journaled for a job, over all runs"""
+        row = self.db.get_connection().execute(
+            "SELECT phase FROM posting_journal WHERE job_id = ? ORDER BY id DESC LIMIT 1", (job_id,)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def may_be_published(self, job_id: int) -> bool:
+        """whether any earlier attempt reached the publish click, whatever was journaled after it"""
+        row = self.db.get_connection().execute(
+            f"SELECT 1 FROM posting_journal WHERE job_id = ? AND phase IN ({', '.join('?' * len(PUBLISH_PHASES))}) LIMIT 1",
+            (job_id, *PUBLISH_PHASES)
+        ).fetchone()
+        return row is not None
\ No newline at end of file
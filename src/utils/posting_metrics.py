@@ -0,0 +1,137 @@
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+from .db_handler import DatabaseHandler
+
+# form phases in posting order, as reported
+PHASES = ['navigate', 'title', 'price', 'category', 'condition', 'photo', 'description', 'publish']
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """nearest-rank percentile of already sorted values"""
+    if not values:
+        return None
+    rank = max(1, math.ceil(len(values) * pct / 100))
+    return values[rank - 1]
+
+class PhaseTimer:
+    """times one posting attempt phase by phase, written out when the attempt ends"""
+    
+    def __init__(self, metrics: 'PostingMetrics', run_id: str, job: Dict):
+        self.metrics = metrics
+        self.run_id = run_id
+        self.job = job
+        self.timings: List[Tuple[str, float, float, bool]] = []
+        self._phase: Optional[str] = None
+        self._started_at = 0.0
+        self._started = 0.0
+    
+    def begin(self, phase: str):
+        """start timing a phase, ending the one in progress"""
+        self.end()
+        self._phase = phase
+        self._started_at = time.time()
+        self._started = time.perf_counter()
+    
+    def end(self, success: bool = True):
+        """stop timing the phase in progress, if any"""
+        if self._phase is not None:
+            self.timings.append((self._phase, self._started_at, time.perf_counter() - self._started, success))
+            self._phase = None
+    
+    def finish(self, success: bool):
+        """close the attempt, a phase still open on failure is the one that failed"""
+        self.end(success)
+        self.metrics.record(self.run_id, self.job, self.timings)
+
+class PostingMetrics:
+    """per-phase timings of every posting attempt, for finding where posting time goes"""
+    
+    def __init__(self, db: Optional[DatabaseHandler] = None):
+        self.db = db or DatabaseHandler()
+        self._initialize_table()
+    
+    def _initialize_table(self):
+        """create the metrics table if it doesn't exist"""
+        conn = self.db.get_connection()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS posting_metrics (
+                    id INTEGER PRIMARY KEY,
+                    run_id TEXT NOT NULL,
+                    job_id INTEGER NOT NULL,
+                    item_code TEXT NOT NULL,
+                    attempt INTEGER NOT NULL,
+                    phase TEXT NOT NULL,
+                    started_at REAL NOT NULL,
+                    seconds REAL NOT NULL,
+                    success INTEGER NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_posting_metrics_phase ON posting_metrics (phase, seconds)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_posting_metrics_run ON posting_metrics (run_id)")
+    
+    def timer(self, run_id: str, job: Dict) -> PhaseTimer:
+        """start timing an attempt at a claimed job"""
+        return PhaseTimer(self, run_id, job)
+    
+    def record(self, run_id: str, job: Dict, timings: List[Tuple[str, float, float, bool]]):
+        """store an attempt's (phase, started_at, seconds, success) timings in one transaction"""
+        if not timings:
+            return
+        conn = self.db.get_connection()
+        with conn:
+            conn.executemany("""
+                INSERT INTO posting_metrics (run_id, job_id, item_code, attempt, phase, started_at, seconds, success)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (run_id, job['id'], job['item_code'], job['attempts'], phase, started_at, seconds, int(success))
+                for phase, started_at, seconds, success in timings
+            ])
+    
+    def get_phase_stats(self, run_id: Optional[str] = None) -> Dict[str, Dict]:
+        """p50/p95/p99 seconds per phase over successful phases, optionally for one run"""
+        stats = {}
+        for phase in PHASES:
+            sql = "SELECT seconds FROM posting_metrics WHERE phase = ? AND success = 1"
+            params = [phase]
+            if run_id is not None:
+                sql += " AND run_id = ?"
+                params.append(run_id)
+            values = [row[0] for row in self.db.get_connection().execute(f"{sql} ORDER BY seconds", params)]
+            failed = self.db.get_connection().execute(
+                "SELECT COUNT(*) FROM posting_metrics WHERE phase = ? AND success = 0"
+                + (" AND run_id = ?" if run_id is not None else ""), params
+            ).fetchone()[0]
+            stats[phase] = {
+                'count': len(values),
+                'failed': failed,
+                'p50': percentile(values, 50),
+                'p95': percentile(values, 95),
+                'p99': percentile(values, 99),
+                'total': sum(values)
+            }
+        return stats
+    
+    def get_run_stats(self) -> List[Dict]:
+        """posted listings, wall time and listings/hour per run, newest first"""
+        cursor = self.db.get_connection().execute("""
+            SELECT run_id,
+                   COUNT(DISTINCT CASE WHEN phase = 'publish' AND success = 1 THEN job_id END),
+                   COUNT(DISTINCT job_id || ':' || attempt),
+                   MIN(started_at),
+                   MAX(started_at + seconds)
+            FROM posting_metrics
+            GROUP BY run_id
+            ORDER BY MIN(started_at) DESC
+        """)
+        runs = []
+        for run_id, posted, attempts, first, last in cursor.fetchall():
+            seconds = last - first
+            runs.append({
+                'run_id': run_id,
+                'posted': posted,
+                'attempts': attempts,
+                'seconds': seconds,
+                'listings_per_hour': posted * 3600 / seconds if seconds > 0 else None
+            })
+        return runs
\ No newline at end of file
@@ -11,7 +11,9 @@ class ProgressBar:
         self.start_time = time.time()
         self.step_manager = StepManager()
         self.running = True
+        self.paused = False
         self.debug_messages = []  # store debug messages
+        self.worker_status = {}  # what each posting worker is doing, by worker name
         
         # start animation thread
         self.animation_thread = threading.Thread(target=self._animate)
@@ -70,7 +72,9 @@ class ProgressBar:
             current_status = current.status if current else StepStatus.PENDING
             
             # draw progress bar
-            if current_status == StepStatus.WAITING and anim_char:
+            if self.paused:
+                bar = "[paused - press p to resume]"
+            elif current_status == StepStatus.WAITING and anim_char:
                 bar = f"[{anim_char} waiting...]"
             else:
                 bar = f"[{'=' * filled}{' ' * (bar_width - filled)}]"
@@ -85,8 +89,15 @@ class ProgressBar:
                 status_text = f"Step {current_step}/{total_steps} ({elapsed:.1f}s): {current.description}"
                 self.stdscr.addstr(self.start_y + 1, 2, status_text[:width-3], colors[current_status])
             
+            # draw one status line per posting worker
+            workers = list(self.worker_status.items())
+            for i, (name, status) in enumerate(workers):
+                self.stdscr.move(self.start_y + 3 + i, 0)
+                self.stdscr.clrtoeol()
+                self.stdscr.addstr(self.start_y + 3 + i, 2, f"{name}: {status}"[:width-3], curses.color_pair(3))
+            
             # draw debug section
-            debug_start_y = self.start_y + 3
+            debug_start_y = self.start_y + 3 + (len(workers) + 1 if workers else 0)
             self.stdscr.addstr(debug_start_y, 2, "Debug Log:", curses.A_BOLD)
             for i, (msg, is_error) in enumerate(self.debug_messages):
                 if debug_start_y + i + 1 < height - 1:  # prevent overflow
@@ -101,6 +112,18 @@ class ProgressBar:
         """add a new step"""
         return self.step_manager.add_step(description)
     
+    def set_worker_status(self, name: str, status: str):
+        """show what a posting worker is doing"""
+        self.worker_status[name] = status
+    
+    def set_paused(self, paused: bool):
+        """show or clear the paused state"""
+        self.paused = paused
+    
+    def plan_steps(self, count: int):
+        """reserve count steps that will be added as they come up"""
+        self.step_manager.plan_steps(count)
+    
     def start_step(self, step: Step):
         """start a step"""
         self.step_manager.start_step(step)
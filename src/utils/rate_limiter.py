@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+class TokenBucket:
+    """a bucket refilled continuously at a per-minute rate, holding at most burst_seconds of it"""
+    
+    def __init__(self, rate_per_minute: float, burst_seconds: float = 10):
+        self.rate = rate_per_minute / 60
+        self.capacity = max(1.0, rate_per_minute * burst_seconds / 60)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def wait_time(self, amount: float) -> float:
+        """seconds until amount tokens are available, 0 if they are now"""
+        self._refill()
+        # a request larger than the bucket only has to wait for a full bucket
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+    
+    def take(self, amount: float):
+        """spend tokens, may go negative to charge for usage found out afterwards"""
+        self._refill()
+        self.tokens -= amount
+
+class RateLimiter:
+    """request and token rate limits shared by every concurrent api call
+    
+    acquire() holds a lock while it waits, so callers are served in order and a big
+    request is not starved by a stream of small ones.
+    """
+    
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self, tokens: int):
+        """wait until one request with an estimated token count may be sent"""
+        async with self._lock:
+            while True:
+                wait = max(
+                    self.requests.wait_time(1),
+                    self.tokens.wait_time(tokens),
+                    self._paused_until - time.monotonic()
+                )
+                if wait <= 0:
+                    self.requests.take(1)
+                    self.tokens.take(tokens)
+                    return
+                await asyncio.sleep(wait)
+    
+    def settle(self, estimated: int, used: int):
+        """correct the token bucket once the real usage of a request is known"""
+        self.tokens.take(used - estimated)
+    
+    def pause(self, seconds: float):
+        """hold every caller back, e.g. after the server answered 429"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
\ No newline at end of file
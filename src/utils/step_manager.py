@@ -19,6 +19,8 @@ class StepManager:
     def __init__(self):
         self.steps: list[Step] = []
         self.current_step_index: int = -1
+        # steps announced up front but added lazily, e.g. one per posted listing
+        self.planned_steps: int = 0
     
     def add_step(self, description: str) -> Step:
         """add a new step"""
@@ -26,10 +28,15 @@ class StepManager:
         self.steps.append(step)
         return step
     
+    def plan_steps(self, count: int):
+        """count steps that will be added later towards the total"""
+        self.planned_steps = len(self.steps) + count
+    
     def start_step(self, step: Step):
         """start a step"""
         step.status = StepStatus.RUNNING
-        self.current_step_index = self.steps.index(step)
+        # search from the end, where lazily added steps are
+        self.current_step_index = next(i for i in range(len(self.steps) - 1, -1, -1) if self.steps[i] is step)
     
     def complete_step(self, step: Step, success: bool = True):
         """complete a step"""
@@ -41,7 +48,7 @@ class StepManager:
     
     @property
     def total_steps(self) -> int:
-        return len(self.steps)
+        return max(len(self.steps), self.planned_steps)
     
     @property
     def current_step(self) -> Optional[Step]: